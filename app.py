@@ -2,9 +2,9 @@
 NLP Document Translator - Main Streamlit Application
 """
 import streamlit as st
+import asyncio
 import sys
 from pathlib import Path
-import io
 import time
 from datetime import datetime
 
@@ -12,20 +12,145 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent / "src"))
 
 from src.document_processor import DocumentProcessor
-from src.translator import DocumentTranslator
+from src.translator import get_shared_translator
 from src.utils import DocumentUtils, LogManager
 from config import *
 
 # Initialize components
 @st.cache_resource
-def init_components():
-    """Initialize document processor and translator"""
-    return {
-        'processor': DocumentProcessor(),
-        'translator': DocumentTranslator(),
-        'utils': DocumentUtils(),
-        'logger': LogManager()
-    }
+def get_processor():
+    """Shared document processor"""
+    return DocumentProcessor()
+
+@st.cache_resource
+def get_translator():
+    """Shared document translator"""
+    return get_shared_translator(translation_memory_path=TRANSLATION_MEMORY_FILE)
+
+@st.cache_resource
+def get_doc_utils():
+    """Shared document utilities"""
+    return DocumentUtils()
+
+@st.cache_resource
+def get_log_manager():
+    """Shared translation log manager"""
+    return LogManager()
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_extract_text(file_digest: str, file_extension: str, _file_content: bytes):
+    """
+    Extract text once per uploaded file content and extension
+
+    Streamlit skips hashing underscore-prefixed arguments, so the cache is
+    keyed on the precomputed digest rather than the full file bytes.
+    """
+    return get_processor().extract_text(_file_content, file_extension)
+
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def cached_detect_language(text_digest: str, _text: str):
+    """Detect the language of extracted text once per distinct text digest"""
+    return get_translator().detect_language(_text)
+
+def translate_document(translator, text, target_lang, source_lang, backend, chunk_size):
+    """Translate a document's text, showing progress as each backend request completes"""
+    progress = st.progress(0.0)
+    partial_preview = st.empty()
+
+    def show_progress(done, total, translated):
+        progress.progress(done / total, text=f"Translated {done}/{total} requests")
+        partial_preview.text(DocumentUtils.truncate_text(translated, 300))
+
+    result = asyncio.run(translator.translate_text_async(
+        text, target_lang, source_lang, backend, chunk_size, progress_callback=show_progress
+    ))
+    translator.save_translation_memory()
+    progress.empty()
+    partial_preview.empty()
+    return result
+
+def translate_pages(translator, pages, target_lang, source_lang, backend, chunk_size):
+    """Translate document pages as they are extracted, showing each page as it completes"""
+    status = st.empty()
+    partial_preview = st.empty()
+    results = []
+
+    async def consume():
+        async for result in translator.translate_text_stream(
+            pages, target_lang, source_lang, backend, chunk_size
+        ):
+            results.append(result)
+            status.markdown(f"**Translated {len(results)} pages**")
+            partial_preview.text(DocumentUtils.truncate_text(result['translated_text'], 300))
+
+    asyncio.run(consume())
+    translator.save_translation_memory()
+    status.empty()
+    partial_preview.empty()
+    return translator.combine_results(results)
+
+def stream_pdf_pages(file_content, page_texts):
+    """Yield PDF page texts as they are extracted, keeping a copy in page_texts"""
+    for _, page_text in get_processor().extract_text_iter(file_content, '.pdf'):
+        page_texts.append(page_text)
+        yield page_text
+
+def show_extraction_preview(doc_utils, extracted_text, details):
+    """Render the extracted text preview with extraction details"""
+    with st.expander("📄 Extracted Text Preview", expanded=False):
+        st.text_area(
+            "Text Preview:",
+            doc_utils.truncate_text(extracted_text, 500),
+            height=150,
+            disabled=True
+        )
+        st.write(f"**Characters:** {len(extracted_text)}")
+        for label, value in details.items():
+            st.write(f"**{label}:** {value}")
+
+def show_translation(doc_utils, translation):
+    """Render a stored translation with its download buttons"""
+    translation_result = translation['result']
+    file_stem = Path(translation['file_name']).stem
+    # Translation info
+    with st.expander("ℹ️ Translation Details", expanded=True):
+        col_a, col_b = st.columns(2)
+        with col_a:
+            st.write(f"**Source:** {doc_utils.get_language_display_name(translation_result['source_language'])}")
+            st.write(f"**Target:** {doc_utils.get_language_display_name(translation_result['target_language'])}")
+        with col_b:
+            st.write(f"**Backend:** {translation_result['backend_used']}")
+            st.write(f"**Chunks:** {translation_result['chunks_processed']}")
+    # Display translated text
+    st.subheader("📝 Translated Text")
+    st.text_area(
+        "Translation Result:",
+        translation_result['translated_text'],
+        height=400,
+        help="You can copy this text from here"
+    )
+    # Download options
+    st.subheader("💾 Download Options")
+    col_dl1, col_dl2 = st.columns(2)
+    with col_dl1:
+        st.download_button(
+            label="📄 Download as TXT",
+            data=translation['translated_bytes'],
+            file_name=f"translated_{file_stem}_{translation['target_lang_code']}.txt",
+            mime="text/plain",
+            use_container_width=True
+        )
+    with col_dl2:
+        if translation['pdf_error']:
+            st.error(f"❌ PDF generation failed: {translation['pdf_error']}")
+        else:
+            st.download_button(
+                label="📑 Download as PDF",
+                data=translation['translated_pdf'],
+                file_name=f"translated_{file_stem}_{translation['target_lang_code']}.pdf",
+                mime="application/pdf",
+                use_container_width=True
+            )
 
 def main():
     """Main application function"""
@@ -38,11 +163,9 @@ def main():
     )
 
     # Initialize components
-    components = init_components()
-    processor = components['processor']
-    translator = components['translator']
-    doc_utils = components['utils']
-    log_manager = components['logger']
+    translator = get_translator()
+    doc_utils = get_doc_utils()
+    log_manager = get_log_manager()
 
     # Application header
     st.title("🌍 Document Translator")
@@ -51,59 +174,63 @@ def main():
     # Sidebar configuration
     with st.sidebar:
         st.header("🔧 Configuration")
-        st.subheader("Translation Settings")
+        # Settings only take effect (and trigger a rerun) when the form is applied
+        with st.form("cfg"):
+            st.subheader("Translation Settings")
 
-        available_languages = translator.get_available_languages()
-        lang_options = [f"{code} - {name}" for code, name in available_languages.items()]
+            available_languages = translator.get_available_languages()
+            lang_options = [f"{code} - {name}" for code, name in available_languages.items()]
 
-        target_language = st.selectbox(
-            "Target Language:",
-            options=lang_options,
-            index=0,
-            help="Select the language to translate to"
-        )
-        # FIX: Handle possible list return and conversion to code
-        if isinstance(target_language, list):
-            target_language = target_language[0] if target_language else "en - English"
-        try:
-            target_lang_code = str(target_language).split(" - ")[0].strip()
-        except (AttributeError, IndexError):
-            target_lang_code = "en"  # Default fallback
-
-        source_language = st.selectbox(
-            "Source Language:",
-            options=["auto - Auto Detect"] + lang_options,
-            index=0,
-            help="Select source language or use auto-detect"
-        )
-        # FIX: Handle possible list return and conversion to code
-        if isinstance(source_language, list):
-            source_language = source_language[0] if source_language else "auto - Auto Detect"
-
-        try:
-            if str(source_language).startswith("auto"):
-                source_lang_code = "auto"
-            else:
-                source_lang_code = str(source_language).split(" - ")[0].strip()
-        except (AttributeError, IndexError):
-            source_lang_code = "auto"  # Default fallback
-
-        st.subheader("Advanced Settings")
-        backend = st.selectbox(
-            "Translation Backend:",
-            options=['google', 'microsoft', 'libre', 'mymemory'],
-            index=0,
-            help="Choose translation service"
-        )
+            target_language = st.selectbox(
+                "Target Language:",
+                options=lang_options,
+                index=0,
+                help="Select the language to translate to"
+            )
+            # FIX: Handle possible list return and conversion to code
+            if isinstance(target_language, list):
+                target_language = target_language[0] if target_language else "en - English"
+            try:
+                target_lang_code = str(target_language).split(" - ")[0].strip()
+            except (AttributeError, IndexError):
+                target_lang_code = "en"  # Default fallback
 
-        chunk_size = st.slider(
-            "Chunk Size (characters):",
-            min_value=1000,
-            max_value=10000,
-            value=5000,
-            step=500,
-            help="Size of text chunks for translation"
-        )
+            source_language = st.selectbox(
+                "Source Language:",
+                options=["auto - Auto Detect"] + lang_options,
+                index=0,
+                help="Select source language or use auto-detect"
+            )
+            # FIX: Handle possible list return and conversion to code
+            if isinstance(source_language, list):
+                source_language = source_language[0] if source_language else "auto - Auto Detect"
+
+            try:
+                if str(source_language).startswith("auto"):
+                    source_lang_code = "auto"
+                else:
+                    source_lang_code = str(source_language).split(" - ")[0].strip()
+            except (AttributeError, IndexError):
+                source_lang_code = "auto"  # Default fallback
+
+            st.subheader("Advanced Settings")
+            backend = st.selectbox(
+                "Translation Backend:",
+                options=['google', 'microsoft', 'libre', 'mymemory'],
+                index=0,
+                help="Choose translation service"
+            )
+
+            chunk_size = st.slider(
+                "Chunk Size (characters):",
+                min_value=1000,
+                max_value=10000,
+                value=5000,
+                step=500,
+                help="Size of text chunks for translation"
+            )
+
+            st.form_submit_button("Apply", use_container_width=True)
 
         st.info(f"📋 **File Limits**\n- Max size: {MAX_FILE_SIZE // (1024*1024)}MB\n- Formats: PDF, DOCX, TXT")
 
@@ -141,63 +268,93 @@ def main():
     with col2:
         st.subheader("🔄 Translation Results")
         if uploaded_file is not None and translate_button:
+            st.session_state.pop('translation', None)
             with st.spinner("Processing document..."):
                 try:
+                    # Reject oversize uploads before reading them into memory
+                    if uploaded_file.size > MAX_FILE_SIZE:
+                        st.error(f"❌ File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB, "
+                                 f"your file: {uploaded_file.size / (1024*1024):.2f}MB")
+                        return
                     file_content = uploaded_file.read()
                     uploaded_file.seek(0)
                     validation = doc_utils.validate_file(file_content, uploaded_file.name)
                     if not validation['valid']:
                         st.error(f"❌ {validation['error']}")
                         return
-                    st.info("📖 Extracting text from document...")
                     file_extension = Path(uploaded_file.name).suffix.lower()
-                    extraction_result = processor.extract_text(
-                        io.BytesIO(file_content),
-                        file_extension
-                    )
-                    if extraction_result['error']:
-                        st.error(f"❌ Text extraction failed: {extraction_result['error']}")
-                        return
-                    extracted_text = extraction_result['text']
-                    if not extracted_text.strip():
-                        st.warning("⚠️ No text found in document")
-                        return
-                    # Display extraction info
-                    with st.expander("📄 Extracted Text Preview", expanded=False):
-                        st.text_area(
-                            "Text Preview:",
-                            doc_utils.truncate_text(extracted_text, 500),
-                            height=150,
-                            disabled=True
+                    if file_extension == '.pdf':
+                        # Pages are translated while later ones are still being extracted
+                        st.info("📖 Extracting and translating PDF pages...")
+                        page_texts = []
+                        try:
+                            translation_result = translate_pages(
+                                translator,
+                                stream_pdf_pages(file_content, page_texts),
+                                target_lang_code,
+                                source_lang_code,
+                                backend,
+                                chunk_size
+                            )
+                        except ValueError as e:
+                            st.error(f"❌ Text extraction failed: {str(e)}")
+                            return
+                        extracted_text = "\n\n".join(page_texts).strip()
+                        if not extracted_text:
+                            st.warning("⚠️ No text found in document")
+                            return
+                        show_extraction_preview(doc_utils, extracted_text, {"Pages": len(page_texts)})
+                        detected_lang = translation_result['source_language'] or source_lang_code
+                        if source_lang_code == 'auto' and detected_lang:
+                            st.success(f"✅ Detected language: {doc_utils.get_language_display_name(detected_lang)}")
+                        if translation_result.get('note'):
+                            st.info("ℹ️ Source and target languages are the same. No translation needed.")
+                            st.text_area("Original Text:", extracted_text, height=300, disabled=True)
+                            return
+                    else:
+                        st.info("📖 Extracting text from document...")
+                        extraction_result = cached_extract_text(
+                            doc_utils.generate_file_hash(file_content), file_extension, file_content
                         )
-                        st.write(f"**Characters:** {len(extracted_text)}")
-                        st.write(f"**Extraction Method:** {extraction_result.get('method', 'unknown')}")
-                    # Detect language if auto
-                    if source_lang_code == 'auto':
-                        st.info("🔍 Detecting source language...")
-                        detection_result = translator.detect_language(extracted_text)
-                        if detection_result['error']:
-                            st.warning(f"⚠️ Language detection failed: {detection_result['error']}")
-                            detected_lang = 'en'
+                        if extraction_result['error']:
+                            st.error(f"❌ Text extraction failed: {extraction_result['error']}")
+                            return
+                        extracted_text = extraction_result['text']
+                        if not extracted_text.strip():
+                            st.warning("⚠️ No text found in document")
+                            return
+                        show_extraction_preview(doc_utils, extracted_text, {
+                            "Extraction Method": extraction_result.get('method', 'unknown')
+                        })
+                        # Detect language if auto
+                        if source_lang_code == 'auto':
+                            st.info("🔍 Detecting source language...")
+                            detection_result = cached_detect_language(
+                                doc_utils.generate_file_hash(extracted_text.encode('utf-8')), extracted_text
+                            )
+                            if detection_result['error']:
+                                st.warning(f"⚠️ Language detection failed: {detection_result['error']}")
+                                detected_lang = 'en'
+                            else:
+                                detected_lang = detection_result['language']
+                                st.success(f"✅ Detected language: {doc_utils.get_language_display_name(detected_lang)} "
+                                        f"(Confidence: {detection_result['confidence']:.2f})")
                         else:
-                            detected_lang = detection_result['language']
-                            st.success(f"✅ Detected language: {doc_utils.get_language_display_name(detected_lang)} "
-                                    f"(Confidence: {detection_result['confidence']:.2f})")
-                    else:
-                        detected_lang = source_lang_code
-                    if detected_lang == target_lang_code:
-                        st.info("ℹ️ Source and target languages are the same. No translation needed.")
-                        st.text_area("Original Text:", extracted_text, height=300, disabled=True)
-                        return
-                    st.info(f"🔄 Translating from {doc_utils.get_language_display_name(detected_lang)} "
-                        f"to {doc_utils.get_language_display_name(target_lang_code)}...")
-                    translation_result = translator.translate_text(
-                        extracted_text,
-                        target_lang_code,
-                        detected_lang,
-                        backend,
-                        chunk_size
-                    )
+                            detected_lang = source_lang_code
+                        if detected_lang == target_lang_code:
+                            st.info("ℹ️ Source and target languages are the same. No translation needed.")
+                            st.text_area("Original Text:", extracted_text, height=300, disabled=True)
+                            return
+                        st.info(f"🔄 Translating from {doc_utils.get_language_display_name(detected_lang)} "
+                            f"to {doc_utils.get_language_display_name(target_lang_code)}...")
+                        translation_result = translate_document(
+                            translator,
+                            extracted_text,
+                            target_lang_code,
+                            detected_lang,
+                            backend,
+                            chunk_size
+                        )
                     if translation_result['error']:
                         st.error(f"❌ Translation failed: {translation_result['error']}")
                         log_manager.log_translation(
@@ -207,51 +364,26 @@ def main():
                         return
                     translated_text = translation_result['translated_text']
                     st.success(f"✅ Translation completed!")
-                    # Translation info
-                    with st.expander("ℹ️ Translation Details", expanded=True):
-                        col_a, col_b = st.columns(2)
-                        with col_a:
-                            st.write(f"**Source:** {doc_utils.get_language_display_name(translation_result['source_language'])}")
-                            st.write(f"**Target:** {doc_utils.get_language_display_name(translation_result['target_language'])}")
-                        with col_b:
-                            st.write(f"**Backend:** {translation_result['backend_used']}")
-                            st.write(f"**Chunks:** {translation_result['chunks_processed']}")
-                    # Display translated text
-                    st.subheader("📝 Translated Text")
-                    st.text_area(
-                        "Translation Result:",
-                        translated_text,
-                        height=400,
-                        help="You can copy this text from here"
-                    )
-                    # Download options
-                    st.subheader("💾 Download Options")
-                    col_dl1, col_dl2 = st.columns(2)
-                    with col_dl1:
-                        txt_download = st.download_button(
-                            label="📄 Download as TXT",
-                            data=translated_text.encode('utf-8'),
-                            file_name=f"translated_{Path(uploaded_file.name).stem}_{target_lang_code}.txt",
-                            mime="text/plain",
-                            use_container_width=True
+                    # Encode the text and build the PDF once per translation;
+                    # reruns (e.g. download clicks) render them from session state
+                    translated_pdf, pdf_error = None, None
+                    try:
+                        translated_pdf = doc_utils.create_translated_pdf(
+                            uploaded_file.name,
+                            translated_text,
+                            translation_result['source_language'],
+                            translation_result['target_language']
                         )
-                    with col_dl2:
-                        try:
-                            pdf_content = doc_utils.create_translated_pdf(
-                                uploaded_file.name,
-                                translated_text,
-                                translation_result['source_language'],
-                                translation_result['target_language']
-                            )
-                            pdf_download = st.download_button(
-                                label="📑 Download as PDF",
-                                data=pdf_content,
-                                file_name=f"translated_{Path(uploaded_file.name).stem}_{target_lang_code}.pdf",
-                                mime="application/pdf",
-                                use_container_width=True
-                            )
-                        except Exception as e:
-                            st.error(f"❌ PDF generation failed: {str(e)}")
+                    except Exception as e:
+                        pdf_error = str(e)
+                    st.session_state['translation'] = {
+                        'file_name': uploaded_file.name,
+                        'target_lang_code': target_lang_code,
+                        'result': translation_result,
+                        'translated_bytes': translated_text.encode('utf-8'),
+                        'translated_pdf': translated_pdf,
+                        'pdf_error': pdf_error
+                    }
                     log_manager.log_translation(
                         uploaded_file.name, 
                         translation_result['source_language'], 
@@ -265,6 +397,9 @@ def main():
                         source_lang_code, target_lang_code,
                         False, str(e)
                     )
+        translation = st.session_state.get('translation')
+        if uploaded_file is not None and translation and translation['file_name'] == uploaded_file.name:
+            show_translation(doc_utils, translation)
         elif not uploaded_file:
             st.info("👈 Upload a document to see translation results here")
 
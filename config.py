@@ -34,6 +34,15 @@ DEFAULT_SOURCE_LANG = 'auto'
 DEFAULT_TARGET_LANG = 'en'
 CHUNK_SIZE = 5000  # Characters per translation chunk
 
+# Streamlit cache settings for extracted text and language detection
+CACHE_TTL = 24 * 60 * 60  # Seconds
+CACHE_MAX_ENTRIES = 16
+
+# Optional file persisting chunk translations across runs (JSON Lines).
+# Off by default because it stores uploaded document text in plaintext;
+# set the TRANSLATION_MEMORY_FILE environment variable to enable it.
+TRANSLATION_MEMORY_FILE = os.environ.get('TRANSLATION_MEMORY_FILE') or None
+
 # Streamlit settings
 STREAMLIT_CONFIG = {
     'page_title': 'NLP Document Translator',
@@ -5,15 +5,50 @@ import io
 import fitz  # PyMuPDF
 from pypdf import PdfReader
 from docx import Document
+from docx.oxml.ns import qn
 import docx2python
+from charset_normalizer import from_bytes
 from pathlib import Path
 import logging
-from typing import Optional, Union, Dict, Any
+from typing import Optional, Union, Dict, Any, List, Iterator, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import os
+import re
+import tempfile
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# WordprocessingML tags used when walking DOCX XML directly
+W_P, W_TBL, W_TR, W_TC = qn('w:p'), qn('w:tbl'), qn('w:tr'), qn('w:tc')
+W_R, W_HYPERLINK = qn('w:r'), qn('w:hyperlink')
+W_T, W_TAB, W_BR, W_CR, W_TYPE = qn('w:t'), qn('w:tab'), qn('w:br'), qn('w:cr'), qn('w:type')
+
+# Characters that signal a broken PDF text layer: control characters other
+# than whitespace, private-use glyph codes, and the replacement character
+UNREADABLE_CHARS_RE = re.compile('[\x00-\x08\x0e-\x1f\x7f-\x9f\ue000-\uf8ff\ufffd]')
+
+# Document opened once by each PDF extraction worker process
+_worker_pdf = None
+
+def _open_worker_pdf(data: bytes) -> None:
+    """Open the PDF being extracted in a worker process"""
+    global _worker_pdf
+    _worker_pdf = fitz.open(stream=data, filetype="pdf")
+
+def _extract_pdf_page_range(start: int, stop: int, flags: int, data: Optional[bytes] = None) -> List[str]:
+    """Extract text of PDF pages [start, stop), from the worker's document unless data is given"""
+    doc = _worker_pdf if data is None else fitz.open(stream=data, filetype="pdf")
+    try:
+        return [
+            doc.load_page(page_num).get_textpage(flags=flags).extractText() 
+            for page_num in range(start, stop)
+        ]
+    finally:
+        if data is not None:
+            doc.close()
+
 class DocumentProcessor:
     """
     Handles text extraction from PDF, DOCX, and TXT files
@@ -21,6 +56,23 @@ class DocumentProcessor:
     
     def __init__(self):
         self.supported_formats = {'.pdf', '.docx', '.txt'}
+        # Large PDFs are extracted by a pool of processes (MuPDF does not
+        # support multithreaded use); smaller ones sequentially, where
+        # process startup would cost more than it saves
+        self.max_pdf_workers = min(8, os.cpu_count() or 1)
+        self.pdf_process_min_pages = 200
+        # Pages per worker task, so pages stream back in order while the
+        # rest of the document is still being extracted
+        self.pdf_process_range_pages = 16
+        # PDF text quality gate deciding whether to escalate to pypdf
+        self.pdf_min_chars_per_page = 50
+        self.pdf_min_readable_ratio = 0.7
+        self.pdf_quality_sample_size = 4096
+        # Plain-text extraction only: skip image blocks and ligature
+        # preservation, and ignore text outside the page mediabox
+        self.pdf_text_flags = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+        # Directory for temporary files, RAM-backed on Linux when available
+        self.temp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
     
     def extract_text(self, file_path_or_bytes: Union[str, Path, bytes, io.BytesIO], 
                     file_extension: str) -> Dict[str, Any]:
@@ -50,98 +102,228 @@ class DocumentProcessor:
             logger.error(f"Error extracting text: {str(e)}")
             return {"text": "", "error": str(e), "pages": 0}
     
-    def _extract_pdf_text(self, file_input: Union[str, Path, bytes, io.BytesIO]) -> Dict[str, Any]:
-        """Extract text from PDF using PyMuPDF (primary) with pypdf fallback"""
-        try:
-            # Try PyMuPDF first (better for complex layouts)
-            if isinstance(file_input, (str, Path)):
-                doc = fitz.open(file_input)
-            else:
-                # Handle bytes or BytesIO
-                if isinstance(file_input, io.BytesIO):
-                    doc = fitz.open(stream=file_input.getvalue(), filetype="pdf")
-                else:
-                    doc = fitz.open(stream=file_input, filetype="pdf")
-            
-            full_text = ""
-            pages = len(doc)
+    def extract_text_iter(self, file_path_or_bytes: Union[str, Path, bytes, io.BytesIO], 
+                          file_extension: str) -> Iterator[Tuple[int, str]]:
+        """
+        Lazily extract text, yielding one page at a time
+        
+        PDF pages are extracted with PyMuPDF as they are consumed, so callers
+        can start working on early pages before the whole document is read.
+        The first pdf_quality_sample_size characters go through the same
+        quality gate as extract_text; if they fail it (or PyMuPDF fails),
+        the whole PDF is extracted with the pypdf fallback instead. Other
+        formats have no pages and yield their full text once.
+        
+        Args:
+            file_path_or_bytes: File path, bytes, or BytesIO object
+            file_extension: File extension (.pdf, .docx, .txt)
             
-            for page_num in range(pages):
-                page = doc[page_num]
-                full_text += page.get_text() + "\n\n"
-            
-            doc.close()
+        Yields:
+            Tuples of (page_index, page_text)
             
+        Raises:
+            ValueError: If the document cannot be extracted
+        """
+        if file_extension.lower() != '.pdf':
+            result = self.extract_text(file_path_or_bytes, file_extension)
+            if result['error']:
+                raise ValueError(result['error'])
+            yield 0, result['text']
+            return
+        
+        data = self._as_bytes(file_path_or_bytes)
+        pages = self._iter_pdf_pages_pymupdf(data)
+        sample = []
+        try:
+            sample_length = 0
+            for page_text in pages:
+                sample.append(page_text)
+                sample_length += len(page_text)
+                if sample_length >= self.pdf_quality_sample_size:
+                    break
+            quality = self._assess_pdf_text_quality("\n\n".join(sample).strip(), len(sample))
+        except Exception as e:
+            logger.warning(f"PyMuPDF failed, trying pypdf: {str(e)}")
+            quality = "none"
+        
+        if quality == "good":
+            yield from enumerate(sample)
+            yield from enumerate(pages, start=len(sample))
+            return
+        
+        pages.close()
+        if quality == "poor":
+            logger.warning("PyMuPDF text quality is poor, trying pypdf")
+        result = self._extract_pdf_text(data)
+        if result['error']:
+            raise ValueError(result['error'])
+        yield from enumerate(result['page_texts'])
+    
+    def _extract_pdf_text(self, file_input: Union[str, Path, bytes, io.BytesIO]) -> Dict[str, Any]:
+        """
+        Extract text from PDF using PyMuPDF, escalating to pypdf only when
+        PyMuPDF fails or its text does not pass the quality check
+        """
+        data = self._as_bytes(file_input)
+        
+        result = None
+        try:
+            result = self._extract_pdf_text_pymupdf(data)
+            if result["quality"] == "good":
+                return result
+            logger.warning("PyMuPDF text quality is poor, trying pypdf")
+        except Exception as e:
+            logger.warning(f"PyMuPDF failed, trying pypdf: {str(e)}")
+        
+        try:
+            fallback = self._extract_pdf_text_pypdf(data)
+        except Exception as e2:
+            if result is not None:
+                return result
+            logger.error(f"Both PDF extraction methods failed: {str(e2)}")
             return {
-                "text": full_text.strip(),
-                "pages": pages,
-                "method": "PyMuPDF",
-                "error": None
+                "text": "",
+                "pages": 0,
+                "method": "none",
+                "quality": "none",
+                "error": f"PDF extraction failed: {str(e2)}"
             }
-            
+        
+        # Keep whichever parser recovered more text
+        if result is None or len(fallback["text"]) > len(result["text"]):
+            return fallback
+        return result
+    
+    def _extract_pdf_text_pymupdf(self, data: bytes) -> Dict[str, Any]:
+        """Extract text from PDF bytes using PyMuPDF (better for complex layouts)"""
+        page_texts = list(self._iter_pdf_pages_pymupdf(data))
+        
+        full_text = "\n\n".join(page_texts).strip()
+        pages = len(page_texts)
+        
+        return {
+            "text": full_text,
+            "page_texts": page_texts,
+            "pages": pages,
+            "method": "PyMuPDF",
+            "quality": self._assess_pdf_text_quality(full_text, pages),
+            "error": None
+        }
+    
+    def _extract_pdf_text_pypdf(self, data: bytes) -> Dict[str, Any]:
+        """Extract text from PDF bytes using pypdf"""
+        reader = PdfReader(io.BytesIO(data))
+        page_texts = [page.extract_text() for page in reader.pages]
+        
+        full_text = "\n\n".join(page_texts).strip()
+        pages = len(page_texts)
+        
+        return {
+            "text": full_text,
+            "page_texts": page_texts,
+            "pages": pages,
+            "method": "pypdf",
+            "quality": self._assess_pdf_text_quality(full_text, pages),
+            "error": None
+        }
+    
+    def _assess_pdf_text_quality(self, text: str, pages: int) -> str:
+        """Cheap check of extracted PDF text: 'good' or 'poor'"""
+        if not text or len(text) < self.pdf_min_chars_per_page * pages:
+            return "poor"
+        
+        sample = text[:self.pdf_quality_sample_size]
+        unreadable = len(UNREADABLE_CHARS_RE.findall(sample))
+        if 1 - unreadable / len(sample) < self.pdf_min_readable_ratio:
+            return "poor"
+        return "good"
+    
+    def _open_pdf(self, data: bytes) -> "fitz.Document":
+        """Open PDF bytes with PyMuPDF"""
+        return fitz.open(stream=data, filetype="pdf")
+    
+    def _iter_pdf_pages_pymupdf(self, data: bytes) -> Iterator[str]:
+        """Yield each page's PyMuPDF text in order, from worker processes for large PDFs"""
+        with self._open_pdf(data) as doc:
+            pages = doc.page_count
+            workers = self.max_pdf_workers if pages >= self.pdf_process_min_pages else 1
+            if workers == 1:
+                for page_num in range(pages):
+                    yield self._extract_pdf_page(doc, page_num)
+                return
+        
+        yield from self._iter_pdf_pages_in_processes(data, pages, workers)
+    
+    def _iter_pdf_pages_in_processes(self, data: bytes, pages: int, workers: int) -> Iterator[str]:
+        """Yield all pages in order, extracting short page ranges on worker processes"""
+        step = min(self.pdf_process_range_pages, -(-pages // workers))
+        starts = range(0, pages, step)
+        done = 0
+        executor = None
+        try:
+            # Spawned (not forked) workers, since the host process is
+            # multithreaded; each opens the document once
+            executor = ProcessPoolExecutor(max_workers=workers, 
+                                           mp_context=multiprocessing.get_context('spawn'),
+                                           initializer=_open_worker_pdf, initargs=(data,))
+            results = executor.map(
+                _extract_pdf_page_range, 
+                starts, [min(start + step, pages) for start in starts], 
+                [self.pdf_text_flags] * len(starts)
+            )
+            for texts in results:
+                for text in texts:
+                    yield text
+                    done += 1
+            return
         except Exception as e:
-            logger.warning(f"PyMuPDF failed, trying pypdf: {str(e)}")
-            # Fallback to pypdf
-            try:
-                if isinstance(file_input, (str, Path)):
-                    with open(file_input, 'rb') as file:
-                        reader = PdfReader(file)
-                        full_text = ""
-                        for page in reader.pages:
-                            full_text += page.extract_text() + "\n\n"
-                else:
-                    # Reset BytesIO position if needed
-                    if hasattr(file_input, 'seek'):
-                        file_input.seek(0)
-                    reader = PdfReader(file_input)
-                    full_text = ""
-                    for page in reader.pages:
-                        full_text += page.extract_text() + "\n\n"
-                
-                return {
-                    "text": full_text.strip(),
-                    "pages": len(reader.pages),
-                    "method": "pypdf",
-                    "error": None
-                }
-                
-            except Exception as e2:
-                logger.error(f"Both PDF extraction methods failed: {str(e2)}")
-                return {
-                    "text": "",
-                    "pages": 0,
-                    "method": "none",
-                    "error": f"PDF extraction failed: {str(e2)}"
-                }
+            logger.warning(f"Parallel PDF extraction failed, extracting sequentially: {str(e)}")
+        finally:
+            # Also reached when the consumer stops early: drop queued ranges
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        
+        yield from _extract_pdf_page_range(done, pages, self.pdf_text_flags, data)
+    
+    def _extract_pdf_page(self, doc: "fitz.Document", page_num: int) -> str:
+        """Extract one page's text through a single TextPage"""
+        textpage = doc.load_page(page_num).get_textpage(flags=self.pdf_text_flags)
+        return textpage.extractText()
     
     def _extract_docx_text(self, file_input: Union[str, Path, bytes, io.BytesIO]) -> Dict[str, Any]:
         """Extract text from DOCX using python-docx (primary) with docx2python fallback"""
+        data = self._as_bytes(file_input)
+        
         try:
             # Try python-docx first
-            if isinstance(file_input, (str, Path)):
-                doc = Document(file_input)
-            else:
-                # Handle bytes or BytesIO
-                if isinstance(file_input, io.BytesIO):
-                    doc = Document(file_input)
-                else:
-                    doc = Document(io.BytesIO(file_input))
-            
-            full_text = ""
-            for paragraph in doc.paragraphs:
-                full_text += paragraph.text + "\n"
+            doc = Document(io.BytesIO(data))
             
-            # Extract text from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        full_text += cell.text + "\t"
-                    full_text += "\n"
+            # Walk the body XML once in document order instead of going
+            # through python-docx's per-paragraph/per-cell proxy objects
+            parts = []
+            paragraphs = tables = 0
+            for element in doc.element.body.iterchildren(W_P, W_TBL):
+                if element.tag == W_P:
+                    paragraphs += 1
+                    parts.append(self._docx_paragraph_text(element))
+                    parts.append("\n")
+                    continue
+                
+                # Extract text from tables
+                tables += 1
+                for row in element.iterchildren(W_TR):
+                    for cell in row.iterchildren(W_TC):
+                        parts.append("\n".join(
+                            self._docx_paragraph_text(paragraph) 
+                            for paragraph in cell.iterchildren(W_P)
+                        ))
+                        parts.append("\t")
+                    parts.append("\n")
             
             return {
-                "text": full_text.strip(),
-                "paragraphs": len(doc.paragraphs),
-                "tables": len(doc.tables),
+                "text": "".join(parts).strip(),
+                "paragraphs": paragraphs,
+                "tables": tables,
                 "method": "python-docx",
                 "error": None
             }
@@ -150,22 +332,21 @@ class DocumentProcessor:
             logger.warning(f"python-docx failed, trying docx2python: {str(e)}")
             # Fallback to docx2python
             try:
-                if isinstance(file_input, (str, Path)):
-                    result = docx2python.docx2python(file_input)
-                else:
-                    # docx2python expects file path, so we'll save temporarily
-                    import tempfile
-                    with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as tmp_file:
-                        if isinstance(file_input, io.BytesIO):
-                            tmp_file.write(file_input.getvalue())
-                        else:
-                            tmp_file.write(file_input)
-                        tmp_file.flush()
-                        result = docx2python.docx2python(tmp_file.name)
+                # docx2python expects file path, so we'll save temporarily,
+                # preferring RAM-backed storage so the file never hits disk
+                tmp_file = tempfile.NamedTemporaryFile(suffix='.docx', delete=False, 
+                                                       dir=self.temp_dir)
+                try:
+                    tmp_file.write(data)
+                    tmp_file.close()
+                    with docx2python.docx2python(tmp_file.name) as result:
+                        text = result.text
+                finally:
+                    tmp_file.close()
                     os.unlink(tmp_file.name)
                 
                 return {
-                    "text": result.text,
+                    "text": text,
                     "method": "docx2python",
                     "error": None
                 }
@@ -178,17 +359,42 @@ class DocumentProcessor:
                     "error": f"DOCX extraction failed: {str(e2)}"
                 }
     
+    def _docx_paragraph_text(self, paragraph) -> str:
+        """
+        Text of a w:p element, rendering tabs and line breaks like python-docx
+        
+        Only the paragraph's own runs (direct or inside hyperlinks) are read,
+        so text boxes and other nested content anchored in a run are skipped,
+        and page/column breaks produce no text.
+        """
+        pieces = []
+        for child in paragraph.iterchildren(W_R, W_HYPERLINK):
+            runs = (child,) if child.tag == W_R else child.iterchildren(W_R)
+            for run in runs:
+                for node in run.iterchildren(W_T, W_TAB, W_BR, W_CR):
+                    if node.tag == W_T:
+                        pieces.append(node.text or "")
+                    elif node.tag == W_TAB:
+                        pieces.append("\t")
+                    elif node.tag == W_CR or node.get(W_TYPE, 'textWrapping') == 'textWrapping':
+                        pieces.append("\n")
+        return "".join(pieces)
+    
     def _extract_txt_text(self, file_input: Union[str, Path, bytes, io.BytesIO]) -> Dict[str, Any]:
         """Extract text from TXT file"""
+        # Read the input once; every decode attempt below reuses this buffer
         try:
-            if isinstance(file_input, (str, Path)):
-                with open(file_input, 'r', encoding='utf-8') as file:
-                    text = file.read()
-            else:
-                if isinstance(file_input, io.BytesIO):
-                    text = file_input.getvalue().decode('utf-8')
-                else:
-                    text = file_input.decode('utf-8')
+            data = self._as_bytes(file_input)
+        except Exception as e:
+            logger.error(f"TXT extraction failed: {str(e)}")
+            return {
+                "text": "",
+                "method": "none",
+                "error": f"TXT extraction failed: {str(e)}"
+            }
+        
+        try:
+            text = data.decode('utf-8')
             
             return {
                 "text": text,
@@ -198,18 +404,22 @@ class DocumentProcessor:
             }
             
         except UnicodeDecodeError:
+            # Detect the encoding in a single pass over the bytes
+            best_match = from_bytes(data).best()
+            if best_match is not None:
+                text = str(best_match)
+                return {
+                    "text": text,
+                    "lines": len(text.splitlines()),
+                    "method": f"direct-{best_match.encoding}",
+                    "error": None
+                }
+            
             # Try different encodings
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+            encodings = ['latin-1', 'cp1252', 'iso-8859-1']
             for encoding in encodings:
                 try:
-                    if isinstance(file_input, (str, Path)):
-                        with open(file_input, 'r', encoding=encoding) as file:
-                            text = file.read()
-                    else:
-                        if isinstance(file_input, io.BytesIO):
-                            text = file_input.getvalue().decode(encoding)
-                        else:
-                            text = file_input.decode(encoding)
+                    text = data.decode(encoding)
                     
                     return {
                         "text": text,
@@ -234,6 +444,18 @@ class DocumentProcessor:
                 "error": f"TXT extraction failed: {str(e)}"
             }
     
+    def _as_bytes(self, file_input: Union[str, Path, bytes, io.BytesIO]) -> bytes:
+        """Normalize a file path, bytes, or BytesIO input to raw bytes"""
+        if isinstance(file_input, (str, Path)):
+            return Path(file_input).read_bytes()
+        if isinstance(file_input, io.BytesIO):
+            # getvalue() hands back the buffer a BytesIO was created from
+            # without copying; getbuffer() would force a private copy
+            return file_input.getvalue()
+        if isinstance(file_input, bytes):
+            return file_input
+        return bytes(file_input)
+    
     def get_file_info(self, file_input: Union[str, Path, bytes, io.BytesIO], 
                      filename: str = None) -> Dict[str, Any]:
         """Get file information and validate"""
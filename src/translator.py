@@ -1,12 +1,25 @@
 """
 Translation module using multiple translation backends
 """
+import asyncio
+import hashlib
+import json
 import logging
+import os
+import threading
 import time
 import re
-from typing import Dict, List, Optional, Tuple, Any
+import tempfile
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, Any, AsyncIterator, Callable, Coroutine, Iterable, Union
+import numpy as np
 from deep_translator import GoogleTranslator, MicrosoftTranslator, LibreTranslator, MyMemoryTranslator
-from langdetect import detect, DetectorFactory
+from deep_translator.exceptions import TooManyRequests, ServerException, RequestError
+from langdetect import detect_langs, DetectorFactory
 from langdetect.lang_detect_exception import LangDetectException
 
 logging.basicConfig(level=logging.INFO)
@@ -15,36 +28,450 @@ logger = logging.getLogger(__name__)
 # Set seed for consistent language detection
 DetectorFactory.seed = 0
 
+
+# Language detection results keyed on an 8-byte BLAKE2b digest of the sample
+DETECTION_CACHE_SIZE = 1024
+_detection_cache: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+_detection_cache_lock = threading.Lock()
+
+
+def _detect_cached(sample: str) -> Tuple[str, float]:
+    """
+    Most likely language and its probability for a detection sample
+    
+    Detection is deterministic (seeded above), so results are memoized in
+    a small LRU keyed on the sample digest alone (the sample itself is not
+    kept), and documents translated again skip the langdetect scan.
+    """
+    sample_hash = hashlib.blake2b(sample.encode('utf-8', errors='surrogatepass'), digest_size=8).digest()
+    with _detection_cache_lock:
+        result = _detection_cache.get(sample_hash)
+        if result is not None:
+            _detection_cache.move_to_end(sample_hash)
+            return result
+    
+    top_match = detect_langs(sample)[0]
+    result = (top_match.lang, top_match.prob)
+    with _detection_cache_lock:
+        _detection_cache[sample_hash] = result
+        if len(_detection_cache) > DETECTION_CACHE_SIZE:
+            _detection_cache.popitem(last=False)
+    return result
+
+class TranslationCache:
+    """
+    Thread-safe LRU cache of chunk translations
+    
+    Entries are keyed on a 16-byte BLAKE2b digest of the chunk rather than
+    the chunk itself, so large chunks do not bloat the cache keys. When a
+    path is given the cache is loaded from and saved to a JSON Lines file,
+    so it acts as a translation memory across runs. Saves append only the
+    entries added since the previous save; the file is rewritten (through
+    a unique temporary file) once it holds twice ``maxsize`` lines.
+    """
+    
+    def __init__(self, maxsize: int = 8192, path: Optional[Union[str, Path]] = None):
+        self.maxsize = maxsize
+        self.path = Path(path) if path else None
+        self._entries: "OrderedDict[Tuple[bytes, str, str, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._unsaved: List[Tuple[bytes, str, str, str]] = []
+        self._needs_rewrite = False
+        self._saved_lines = 0
+        
+        if self.path:
+            self.load()
+    
+    @staticmethod
+    def make_key(chunk: str, source_lang: str, target_lang: str, 
+                 backend: str) -> Tuple[bytes, str, str, str]:
+        """Build the cache key for a chunk translation"""
+        digest = hashlib.blake2b(chunk.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+        return (digest, source_lang, target_lang, backend)
+    
+    def get(self, key: Tuple[bytes, str, str, str]) -> Optional[str]:
+        """Return the cached translation, or None on a miss"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def put(self, key: Tuple[bytes, str, str, str], value: str) -> None:
+        """Store a translation, evicting the least recently used entry if full"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            if self.path and self._is_translation(key, value):
+                self._unsaved.append(key)
+    
+    @staticmethod
+    def _is_translation(key: Tuple[bytes, str, str, str], value: str) -> bool:
+        """Whether a value is worth persisting (not empty and not an echo of the chunk itself)"""
+        if not value.strip():
+            return False
+        return hashlib.blake2b(value.encode('utf-8', errors='surrogatepass'), digest_size=16).digest() != key[0]
+    
+    def clear(self) -> None:
+        """Remove all cached translations"""
+        with self._lock:
+            self._entries.clear()
+            self._unsaved.clear()
+            self._needs_rewrite = True
+    
+    def load(self) -> None:
+        """Load saved translations from the cache file, skipping malformed entries"""
+        if not self.path or not self.path.exists():
+            return
+        
+        lines = skipped = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f, self._lock:
+                for line in f:
+                    lines += 1
+                    if not line.strip():
+                        continue
+                    try:
+                        key, value = self._parse_entry(line)
+                    except (ValueError, TypeError):
+                        skipped += 1
+                        continue
+                    self._entries[key] = value
+                    self._entries.move_to_end(key)
+                    if len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not load translation memory {self.path}: {str(e)}")
+        
+        self._saved_lines = lines
+        if skipped:
+            logger.warning(f"Skipped {skipped} malformed entries in translation memory {self.path}")
+    
+    @staticmethod
+    def _parse_entry(line: str) -> Tuple[Tuple[bytes, str, str, str], str]:
+        """Parse one saved line into a cache key and translation"""
+        entry = json.loads(line)
+        if not isinstance(entry, list) or len(entry) != 5 or not all(isinstance(item, str) for item in entry):
+            raise ValueError("expected [digest, source, target, backend, translation]")
+        digest, source_lang, target_lang, backend, value = entry
+        key = (bytes.fromhex(digest), source_lang, target_lang, backend)
+        if len(key[0]) != 16 or not TranslationCache._is_translation(key, value):
+            raise ValueError("expected a non-empty translation of a 16-byte digest")
+        return key, value
+    
+    def save(self) -> None:
+        """Append translations added since the last save, compacting the file when it grows too long"""
+        if not self.path:
+            return
+        
+        with self._save_lock:
+            with self._lock:
+                pending = [
+                    (key, self._entries[key]) 
+                    for key in dict.fromkeys(self._unsaved) if key in self._entries
+                ]
+                self._unsaved.clear()
+                rewrite = self._needs_rewrite or self._saved_lines + len(pending) > 2 * self.maxsize
+                if rewrite:
+                    pending = list(self._entries.items())
+                    self._needs_rewrite = False
+            
+            if not pending and not rewrite:
+                return
+            
+            lines = [
+                json.dumps([digest.hex(), source_lang, target_lang, backend, value], ensure_ascii=False) + '\n'
+                for (digest, source_lang, target_lang, backend), value in pending
+            ]
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if rewrite:
+                    fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+                    try:
+                        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                            f.writelines(lines)
+                        os.replace(tmp_path, self.path)
+                    except OSError:
+                        os.unlink(tmp_path)
+                        raise
+                    self._saved_lines = len(lines)
+                else:
+                    with open(self.path, 'a', encoding='utf-8') as f:
+                        f.writelines(lines)
+                    self._saved_lines += len(lines)
+            except OSError as e:
+                logger.warning(f"Could not save translation memory {self.path}: {str(e)}")
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Text cleaned before language detection in a single pass: URLs (group 1)
+# and emails (group 2) are removed, whitespace runs (group 3) collapsed
+DETECTION_CLEAN_RE = re.compile(
+    r'(http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+)'
+    r'|(\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+    r'|(\s+)'
+)
+
+# Extended language names
+LANGUAGE_NAMES = MappingProxyType({
+    'en': 'English', 'hi': 'Hindi', 'mr': 'Marathi', 'sa': 'Sanskrit',
+    'fr': 'French', 'es': 'Spanish', 'de': 'German', 'it': 'Italian',
+    'pt': 'Portuguese', 'ru': 'Russian', 'ja': 'Japanese', 'ko': 'Korean',
+    'zh': 'Chinese', 'ar': 'Arabic', 'th': 'Thai', 'vi': 'Vietnamese'
+})
+
+# Exclusive upper bound on characters per request for each backend
+# (deep-translator only accepts texts with len(text) < max_chars)
+BACKEND_MAX_CHARS = {
+    'google': 5000,
+    'microsoft': 50000,
+    'libre': 2000,
+    'mymemory': 500
+}
+DEFAULT_BACKEND_MAX_CHARS = 5000
+
+# Sentence boundaries (including the Devanagari danda) used for chunking
+SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?\u0964\u0965])\s+')
+WORD_RE = re.compile(r'\S+')
+
+# Code points used by the vectorized chunker for very large texts
+WHITESPACE_CODES = np.array([code for code in range(0x3001) if chr(code).isspace()], dtype=np.uint32)
+SENTENCE_END_CODES = np.array([ord(char) for char in '.!?\u0964\u0965'], dtype=np.uint32)
+
+# Short chunks are packed into one request joined by this separator, and
+# the response is split back apart on it (tolerating changed whitespace)
+PACK_SEPARATOR = "\n%%\n"
+PACK_SPLIT_RE = re.compile(r'\s*%%\s*')
+
+# Published or observed per-minute limits for each backend:
+# rpm = requests per minute, cpm = characters per minute
+BACKEND_PROFILES = {
+    'google': {'rpm': 300},
+    'microsoft': {'rpm': 300, 'cpm': 33000},
+    'libre': {'rpm': 80},
+    'mymemory': {'rpm': 60}
+}
+
+
+class BackpressureController:
+    """
+    AIMD (additive-increase, multiplicative-decrease) concurrency limit
+    for calls to one translation backend
+    
+    Every healthy call raises the limit by ``alpha``. A call slower than
+    ``target_latency`` seconds, or one rejected with a rate-limit/server
+    error, multiplies it by ``beta``. Calls block while the number in
+    flight is at the limit.
+    """
+    
+    def __init__(self, min_concurrency: int = 1, max_concurrency: int = 16, 
+                 initial_concurrency: int = 4, alpha: float = 0.5, 
+                 beta: float = 0.5, target_latency: float = 5.0):
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency = target_latency
+        self.limit = float(initial_concurrency)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+    
+    @contextmanager
+    def slot(self):
+        """Hold one concurrency slot for the duration of a backend call"""
+        self._acquire()
+        start = time.monotonic()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._release(time.monotonic() - start, error)
+    
+    def _acquire(self) -> None:
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+    
+    def _release(self, latency: float, error: Optional[Exception]) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            
+            if error is not None and self._is_overload_error(error):
+                self.limit = max(self.min_concurrency, self.limit * self.beta)
+                logger.warning(f"Backend overloaded, concurrency limit now {int(self.limit)}")
+            elif latency > self.target_latency:
+                self.limit = max(self.min_concurrency, self.limit * self.beta)
+            elif error is None:
+                self.limit = min(self.max_concurrency, self.limit + self.alpha)
+            
+            self._condition.notify_all()
+    
+    @staticmethod
+    def _is_overload_error(error: Exception) -> bool:
+        """Whether an error means the backend is rate limiting or overloaded"""
+        # Google and MyMemory report 5xx responses as RequestError
+        if isinstance(error, (TooManyRequests, ServerException, RequestError)):
+            return True
+        status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+        return status_code is not None and (status_code == 429 or status_code >= 500)
+
+
+class TokenBucket:
+    """
+    Token-bucket limiter smoothing short bursts of requests to one backend
+    
+    Tokens refill continuously at ``rate_per_sec`` up to ``capacity``.
+    ``take`` returns immediately while tokens are available and otherwise
+    blocks only as long as the missing tokens take to refill.
+    """
+    
+    def __init__(self, rate_per_sec: float = 10.0, capacity: float = 10.0):
+        self.rate_per_sec = rate_per_sec
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def take(self, tokens: float = 1.0) -> None:
+        """Block until ``tokens`` tokens are available, then consume them"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                delay = (tokens - self._tokens) / self.rate_per_sec
+            time.sleep(delay)
+
+
+class RateLimiter:
+    """
+    Sliding-window request and character rate limiter for translation backends
+    
+    Limits come from per-backend profiles (requests and characters per
+    minute). deep-translator does not expose response headers, so
+    ``Retry-After``/``X-RateLimit-*`` cannot be read; rejected requests are
+    handled by each backend's BackpressureController instead.
+    """
+    
+    def __init__(self, profiles: Dict[str, Dict[str, int]], window: float = 60.0):
+        self.profiles = profiles
+        self.window = window
+        self._events: Dict[str, deque] = {}
+        self._chars_in_window: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def wait_if_throttled(self, backend: str, chars: int = 0) -> None:
+        """Block until a request of ``chars`` characters fits the backend's budget"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._delay(backend, chars, now)
+                if delay <= 0:
+                    self._events.setdefault(backend, deque()).append((now, chars))
+                    self._chars_in_window[backend] = self._chars_in_window.get(backend, 0) + chars
+                    return
+            time.sleep(delay)
+    
+    def _delay(self, backend: str, chars: int, now: float) -> float:
+        """Seconds to wait before the next request to a backend may start"""
+        events = self._events.get(backend)
+        if events:
+            while events and events[0][0] <= now - self.window:
+                _, expired_chars = events.popleft()
+                self._chars_in_window[backend] -= expired_chars
+        
+        profile = self.profiles.get(backend, {})
+        if not events:
+            return 0.0
+        
+        delay = 0.0
+        window_reset = events[0][0] + self.window - now
+        rpm = profile.get('rpm')
+        if rpm and len(events) >= rpm:
+            delay = max(delay, window_reset)
+        cpm = profile.get('cpm')
+        if cpm and self._chars_in_window[backend] + chars > cpm:
+            delay = max(delay, window_reset)
+        return delay
+
+
 class DocumentTranslator:
     """
     Handles translation of documents using multiple translation backends
     """
     
-    def __init__(self):
-        self.supported_languages = {
-            'en': 'English',
-            'hi': 'Hindi', 
-            'mr': 'Marathi',
-            'sa': 'Sanskrit'  # Limited support
-        }
+    supported_languages = MappingProxyType({
+        'en': 'English',
+        'hi': 'Hindi', 
+        'mr': 'Marathi',
+        'sa': 'Sanskrit'  # Limited support
+    })
+    
+    # Translation backends in order of preference
+    backends = MappingProxyType({
+        'google': GoogleTranslator,
+        'microsoft': MicrosoftTranslator, 
+        'libre': LibreTranslator,
+        'mymemory': MyMemoryTranslator
+    })
+    
+    # Language code mappings for different backends
+    language_mappings = MappingProxyType({
+        'sa': MappingProxyType({  # Sanskrit mappings
+            'google': 'sa',  # May not be fully supported
+            'microsoft': 'sa',
+            'libre': 'en',  # Fallback to English
+            'mymemory': 'sa'
+        })
+    })
+    
+    def __init__(self, translation_memory_path: Optional[Union[str, Path]] = None):
+        # Texts at least this long are chunked with the vectorized splitter
+        self.vectorized_chunking_threshold = 100_000
         
-        # Translation backends in order of preference
-        self.backends = {
-            'google': GoogleTranslator,
-            'microsoft': MicrosoftTranslator, 
-            'libre': LibreTranslator,
-            'mymemory': MyMemoryTranslator
-        }
+        # Maximum number of characters language detection looks at
+        self.detection_sample_size = 4096
         
-        # Language code mappings for different backends
-        self.language_mappings = {
-            'sa': {  # Sanskrit mappings
-                'google': 'sa',  # May not be fully supported
-                'microsoft': 'sa',
-                'libre': 'en',  # Fallback to English
-                'mymemory': 'sa'
-            }
+        # Maximum number of chunks (or packs of chunks) translated concurrently
+        self.max_concurrent_chunks = 8
+        
+        # Adaptive per-backend concurrency limits shared by all translations
+        self.backpressure = {name: BackpressureController() for name in self.backends}
+        self.rate_limiter = RateLimiter(BACKEND_PROFILES)
+        # Buckets refill at each backend's sustained rpm; the small capacity
+        # only lets a few requests through at once before pacing kicks in
+        self.token_bucket_capacity = 3
+        self.token_buckets = {
+            name: TokenBucket(rate_per_sec=BACKEND_PROFILES[name]['rpm'] / 60,
+                              capacity=self.token_bucket_capacity)
+            for name in self.backends
         }
+        
+        # Backend calls run on a persistent pool (not asyncio's per-loop
+        # default executor), so each worker's LRU pool of backend translator
+        # instances outlives the asyncio.run of a single translation
+        self.max_backend_workers = 16
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_backend_workers, thread_name_prefix='translator'
+        )
+        self._thread_local = threading.local()
+        self.translator_pool_size = 128
+        
+        # Successful chunk translations are memoized so repeated text
+        # (headers, footers, boilerplate) is only sent to a backend once
+        self.translation_cache = TranslationCache(path=translation_memory_path)
     
     def detect_language(self, text: str) -> Dict[str, Any]:
         """
@@ -68,8 +495,9 @@ class DocumentTranslator:
                     'error': 'Text too short for reliable detection'
                 }
             
-            detected_lang = detect(clean_text)
-            confidence = self._calculate_confidence(clean_text, detected_lang)
+            # One (memoized) profile scan gives both the language and its probability
+            detected_lang, probability = _detect_cached(self._detection_sample(clean_text))
+            confidence = round(probability, 2)
             
             language_name = self.supported_languages.get(detected_lang, 
                                                        self._get_language_name(detected_lang))
@@ -105,6 +533,10 @@ class DocumentTranslator:
         """
         Translate text using specified backend
         
+        Safe to call while an event loop is running (e.g. in a notebook),
+        but callers already inside a coroutine should await
+        translate_text_async instead of blocking their loop.
+        
         Args:
             text: Text to translate
             target_lang: Target language code
@@ -115,7 +547,120 @@ class DocumentTranslator:
         Returns:
             Dict containing translation results
         """
+        result = self._run_sync(self.translate_text_async(
+            text, target_lang, source_lang, backend, chunk_size
+        ))
+        self.save_translation_memory()
+        return result
+    
+    @staticmethod
+    def _run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+        """
+        Run a coroutine to completion from synchronous code
+        
+        asyncio.run refuses to start while this thread already runs an
+        event loop, so the coroutine then gets its own loop on a short-lived
+        thread (not the backend pool, whose workers it submits to).
+        """
         try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='translator-sync') as runner:
+            return runner.submit(asyncio.run, coro).result()
+    
+    async def translate_text_async(self, text: str, target_lang: str, 
+                                   source_lang: str = 'auto', 
+                                   backend: str = 'google',
+                                   chunk_size: int = 5000,
+                                   progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, Any]:
+        """
+        Translate text using specified backend, translating chunks concurrently
+        
+        Args:
+            text: Text to translate
+            target_lang: Target language code
+            source_lang: Source language code ('auto' for detection)
+            backend: Translation backend to use
+            chunk_size: Size of text chunks for translation
+            progress_callback: Called on the event loop as each backend
+                request finishes, with (requests_done, requests_total,
+                translated_text_of_that_request)
+            
+        Returns:
+            Dict containing translation results
+        """
+        results = await self._translate_texts_async(
+            [text], target_lang, source_lang, backend, chunk_size, progress_callback
+        )
+        return results[0]
+    
+    async def translate_text_stream(self, texts: Iterable[str], target_lang: str, 
+                                    source_lang: str = 'auto', 
+                                    backend: str = 'google',
+                                    chunk_size: int = 5000) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Translate a stream of texts (e.g. document pages), yielding results in order
+        
+        Texts are pulled from the iterable on a single worker thread (so a
+        lazy PDF extractor only ever touches its document from one thread)
+        while earlier texts are being translated. Their chunks feed one
+        running pack, which is sent as soon as the next chunk would push it
+        past the request limit, so pages share requests as if the whole
+        document had been translated at once. With source_lang 'auto', the
+        language is detected once from the first detection_sample_size
+        characters.
+        
+        Args:
+            texts: Iterable of texts to translate
+            target_lang: Target language code
+            source_lang: Source language code ('auto' for detection)
+            backend: Translation backend to use
+            chunk_size: Size of text chunks for translation
+            
+        Yields:
+            Translation result dict for each text, in input order
+        """
+        loop = asyncio.get_running_loop()
+        iterator = iter(texts)
+        exhausted = object()
+        reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='translator-stream')
+        
+        # Source chunk -> future of (translation, backend used)
+        futures: Dict[str, asyncio.Future] = {}
+        tasks = set()
+        semaphore = asyncio.Semaphore(self.max_concurrent_chunks)
+        char_limit = min(chunk_size, self._backend_char_limit(backend))
+        pack: List[str] = []
+        pack_length = 0
+        
+        async def translate_pack(chunks: List[str]) -> None:
+            async with semaphore:
+                try:
+                    translated, pack_backend = await loop.run_in_executor(
+                        self._executor, self._translate_pack_with_fallback, 
+                        chunks, target_lang, source_lang, backend, char_limit
+                    )
+                except Exception as e:
+                    for chunk in chunks:
+                        futures[chunk].set_exception(e)
+                    return
+            for chunk, translated_chunk in zip(chunks, translated):
+                futures[chunk].set_result((translated_chunk, pack_backend))
+        
+        def flush() -> None:
+            nonlocal pack, pack_length
+            if pack:
+                task = asyncio.create_task(translate_pack(pack))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            pack = []
+            pack_length = 0
+        
+        def submit(text: str) -> Tuple[Optional[Dict[str, Any]], List[str], List[str]]:
+            """Queue a text's new chunks, returning (ready result or None, chunks, separators)"""
+            nonlocal pack_length
             if not text.strip():
                 return {
                     'translated_text': '',
@@ -124,17 +669,7 @@ class DocumentTranslator:
                     'backend_used': backend,
                     'chunks_processed': 0,
                     'error': 'Empty text provided'
-                }
-            
-            # Detect source language if auto
-            if source_lang == 'auto':
-                detection_result = self.detect_language(text)
-                if detection_result['error']:
-                    source_lang = 'en'  # Default fallback
-                else:
-                    source_lang = detection_result['language']
-            
-            # Check if translation is needed
+                }, [], []
             if source_lang == target_lang:
                 return {
                     'translated_text': text,
@@ -144,161 +679,604 @@ class DocumentTranslator:
                     'chunks_processed': 1,
                     'error': None,
                     'note': 'No translation needed - same language'
-                }
+                }, [], []
             
-            # Handle Sanskrit special case
-            if target_lang == 'sa' and backend == 'google':
-                logger.warning("Sanskrit may have limited support in Google Translate")
-            
-            # Split text into chunks
-            chunks = self._split_text_into_chunks(text, chunk_size)
-            translated_chunks = []
-            
-            # Try primary backend first
-            backend_success = False
-            backend_used = backend
-            
-            for attempt_backend in [backend, 'google', 'libre', 'mymemory']:
-                try:
-                    translated_chunks = []
-                    for i, chunk in enumerate(chunks):
-                        translated_chunk = self._translate_chunk(
-                            chunk, target_lang, source_lang, attempt_backend
-                        )
-                        translated_chunks.append(translated_chunk)
-                        
-                        # Small delay to avoid rate limiting
-                        if i < len(chunks) - 1:
-                            time.sleep(0.1)
-                    
-                    backend_used = attempt_backend
-                    backend_success = True
-                    break
-                    
-                except Exception as e:
-                    logger.warning(f"Backend {attempt_backend} failed: {str(e)}")
+            chunks, separators = self._split_text_into_chunks(text, char_limit)
+            for chunk in chunks:
+                if chunk in futures:
                     continue
-            
-            if not backend_success:
-                return {
-                    'translated_text': '',
-                    'source_language': source_lang,
-                    'target_language': target_lang,
-                    'backend_used': None,
-                    'chunks_processed': 0,
-                    'error': 'All translation backends failed'
-                }
-            
-            # Combine translated chunks
-            full_translation = ' '.join(translated_chunks)
-            
+                futures[chunk] = loop.create_future()
+                # Same rule as _pack_chunks, applied as chunks arrive
+                added_length = len(chunk) + (len(PACK_SEPARATOR) if pack else 0)
+                if pack and pack_length + added_length > char_limit:
+                    flush()
+                    added_length = len(chunk)
+                pack.append(chunk)
+                pack_length += added_length
+            return None, chunks, separators
+        
+        def page_result(chunks: List[str], separators: List[str]) -> Dict[str, Any]:
+            try:
+                translated = [futures[chunk].result() for chunk in chunks]
+            except Exception as e:
+                logger.error(f"All translation backends failed: {str(e)}")
+                return self._failed_result(source_lang, target_lang, 'All translation backends failed')
             return {
-                'translated_text': full_translation,
+                'translated_text': self._join_chunks([text for text, _ in translated], separators),
                 'source_language': source_lang,
                 'target_language': target_lang,
-                'backend_used': backend_used,
+                'backend_used': ', '.join(dict.fromkeys(used for _, used in translated)) or backend,
                 'chunks_processed': len(chunks),
                 'error': None
             }
+        
+        def is_done(entry) -> bool:
+            ready, chunks, _ = entry
+            return ready is not None or all(futures[chunk].done() for chunk in chunks)
+        
+        def result_of(entry) -> Dict[str, Any]:
+            ready, chunks, separators = entry
+            return ready if ready is not None else page_result(chunks, separators)
+        
+        try:
+            buffered = []
+            if source_lang == 'auto':
+                # Detect source language from the first texts
+                sample_length = 0
+                while sample_length < self.detection_sample_size:
+                    text = await loop.run_in_executor(reader, next, iterator, exhausted)
+                    if text is exhausted:
+                        break
+                    buffered.append(text)
+                    sample_length += len(text)
+                detection_result = self.detect_language('\n\n'.join(buffered))
+                source_lang = 'en' if detection_result['error'] else detection_result['language']
             
-        except Exception as e:
-            logger.error(f"Translation failed: {str(e)}")
-            return {
-                'translated_text': '',
-                'source_language': source_lang,
-                'target_language': target_lang,
-                'backend_used': None,
-                'chunks_processed': 0,
-                'error': f"Translation failed: {str(e)}"
-            }
+            pending = deque(submit(text) for text in buffered)
+            while True:
+                while pending and is_done(pending[0]):
+                    yield result_of(pending.popleft())
+                
+                text = await loop.run_in_executor(reader, next, iterator, exhausted)
+                if text is exhausted:
+                    break
+                pending.append(submit(text))
+            
+            flush()
+            while pending:
+                _, chunks, _ = pending[0]
+                await asyncio.gather(*(futures[chunk] for chunk in chunks), return_exceptions=True)
+                yield result_of(pending.popleft())
+        finally:
+            for task in tasks:
+                task.cancel()
+            reader.shutdown(wait=False)
     
-    def _translate_chunk(self, chunk: str, target_lang: str, 
-                        source_lang: str, backend: str) -> str:
-        """Translate a single chunk of text"""
-        try:
-            # Get appropriate language codes for backend
-            backend_target = self._get_backend_language_code(target_lang, backend)
-            backend_source = self._get_backend_language_code(source_lang, backend) if source_lang != 'auto' else source_lang
+    def combine_results(self, results: List[Dict[str, Any]], 
+                        separator: str = "\n\n") -> Dict[str, Any]:
+        """
+        Merge per-page translation results into a single result
+        
+        Args:
+            results: Translation results in document order
+            separator: Text placed between translated pages
             
-            # Initialize translator based on backend
-            if backend == 'google':
-                translator = GoogleTranslator(source=backend_source, target=backend_target)
-            elif backend == 'microsoft':
-                translator = MicrosoftTranslator(source=backend_source, target=backend_target)
-            elif backend == 'libre':
-                translator = LibreTranslator(source=backend_source, target=backend_target)
-            elif backend == 'mymemory':
-                translator = MyMemoryTranslator(source=backend_source, target=backend_target)
-            else:
-                raise ValueError(f"Unsupported backend: {backend}")
+        Returns:
+            Dict containing the combined translation result
+        """
+        if not results:
+            return self._failed_result(None, None, 'Empty text provided')
+        
+        # Pages without text are reported as errors but do not fail the document
+        translated = [r for r in results if r['error'] != 'Empty text provided']
+        failed = [r for r in translated if r['error']]
+        if failed:
+            return self._failed_result(failed[0]['source_language'], failed[0]['target_language'], failed[0]['error'])
+        if not translated:
+            return results[0]
+        
+        backends = dict.fromkeys(
+            used for r in translated for used in r['backend_used'].split(', ')
+        )
+        
+        combined = {
+            'translated_text': separator.join(r['translated_text'] for r in translated),
+            'source_language': translated[0]['source_language'],
+            'target_language': translated[0]['target_language'],
+            'backend_used': ', '.join(backends),
+            'chunks_processed': sum(r['chunks_processed'] for r in translated),
+            'error': None
+        }
+        if all(r.get('note') for r in translated):
+            combined['note'] = translated[0]['note']
+        return combined
+    
+    async def _translate_texts_async(self, texts: List[str], target_lang: str, 
+                                     source_lang: str, backend: str, chunk_size: int,
+                                     progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                                     max_concurrent: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Translate several texts, packing chunks of different texts into shared requests
+        
+        Texts are grouped by (detected) source language and the chunks of
+        each group are translated together, so short texts share backend
+        requests instead of costing one request each.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        groups: Dict[str, List[int]] = {}
+        
+        for i, text in enumerate(texts):
+            text_source = source_lang
+            try:
+                if not text.strip():
+                    results[i] = {
+                        'translated_text': '',
+                        'source_language': source_lang,
+                        'target_language': target_lang,
+                        'backend_used': backend,
+                        'chunks_processed': 0,
+                        'error': 'Empty text provided'
+                    }
+                    continue
+                
+                # Detect source language if auto
+                if text_source == 'auto':
+                    detection_result = self.detect_language(text)
+                    if detection_result['error']:
+                        text_source = 'en'  # Default fallback
+                    else:
+                        text_source = detection_result['language']
+                
+                # Check if translation is needed
+                if text_source == target_lang:
+                    results[i] = {
+                        'translated_text': text,
+                        'source_language': text_source,
+                        'target_language': target_lang,
+                        'backend_used': backend,
+                        'chunks_processed': 1,
+                        'error': None,
+                        'note': 'No translation needed - same language'
+                    }
+                    continue
+                
+                groups.setdefault(text_source, []).append(i)
+                
+            except Exception as e:
+                logger.error(f"Translation failed: {str(e)}")
+                results[i] = self._failed_result(text_source, target_lang, f"Translation failed: {str(e)}")
+        
+        # Handle Sanskrit special case
+        if groups and target_lang == 'sa' and backend == 'google':
+            logger.warning("Sanskrit may have limited support in Google Translate")
+        
+        group_items = list(groups.items())
+        group_results = await asyncio.gather(*(
+            self._translate_group_async(
+                [texts[i] for i in indices], target_lang, group_source, backend, 
+                chunk_size, progress_callback, max_concurrent
+            )
+            for group_source, indices in group_items
+        ))
+        for (_, indices), translated in zip(group_items, group_results):
+            for i, result in zip(indices, translated):
+                results[i] = result
+        return results
+    
+    async def _translate_group_async(self, texts: List[str], target_lang: str, 
+                                     source_lang: str, backend: str, chunk_size: int,
+                                     progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                                     max_concurrent: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Translate texts sharing a source language, falling back to other backends on failure"""
+        try:
+            # Split texts into chunks no larger than the primary backend accepts;
+            # packs that fail are retried on the fallback backends
+            char_limit = min(chunk_size, self._backend_char_limit(backend))
+            splits = [self._split_text_into_chunks(text, char_limit) for text in texts]
+            try:
+                translated_chunks, chunk_backends = await self._translate_chunks_async(
+                    [chunk for chunks, _ in splits for chunk in chunks], 
+                    target_lang, source_lang, backend, char_limit,
+                    progress_callback, max_concurrent
+                )
+            except Exception as e:
+                logger.error(f"All translation backends failed: {str(e)}")
+                return [self._failed_result(source_lang, target_lang, 'All translation backends failed') for _ in texts]
             
-            # Translate the chunk
-            translated = translator.translate(chunk)
-            return translated if translated else chunk
+            results = []
+            offset = 0
+            for chunks, separators in splits:
+                # Combine translated chunks, keeping the original line and
+                # paragraph breaks between them
+                text_chunks = translated_chunks[offset:offset + len(chunks)]
+                backends_used = dict.fromkeys(chunk_backends[offset:offset + len(chunks)])
+                offset += len(chunks)
+                results.append({
+                    'translated_text': self._join_chunks(text_chunks, separators),
+                    'source_language': source_lang,
+                    'target_language': target_lang,
+                    'backend_used': ', '.join(backends_used) or backend,
+                    'chunks_processed': len(chunks),
+                    'error': None
+                })
+            return results
             
         except Exception as e:
-            logger.error(f"Chunk translation failed with {backend}: {str(e)}")
-            # Return original chunk if translation fails
-            return chunk
+            logger.error(f"Translation failed: {str(e)}")
+            return [self._failed_result(source_lang, target_lang, f"Translation failed: {str(e)}") for _ in texts]
     
-    def _split_text_into_chunks(self, text: str, chunk_size: int) -> List[str]:
-        """Split text into chunks for translation"""
-        if len(text) <= chunk_size:
-            return [text]
+    @staticmethod
+    def _failed_result(source_lang: str, target_lang: str, error: str) -> Dict[str, Any]:
+        """Translation result reporting an error"""
+        return {
+            'translated_text': '',
+            'source_language': source_lang,
+            'target_language': target_lang,
+            'backend_used': None,
+            'chunks_processed': 0,
+            'error': error
+        }
+    
+    async def _translate_chunks_async(self, chunks: List[str], target_lang: str, 
+                                      source_lang: str, backend: str, char_limit: int,
+                                      progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                                      max_concurrent: Optional[int] = None) -> Tuple[List[str], List[str]]:
+        """
+        Translate chunks concurrently, preserving their order
         
-        chunks = []
-        words = text.split()
-        current_chunk = []
+        Returns:
+            Tuple of (translations, backends) where backends[i] is the
+            backend that translated chunks[i]
+        """
+        # Bounded concurrency, further throttled per backend by its token
+        # bucket and BackpressureController, stands in for the old per-chunk sleep
+        semaphore = asyncio.Semaphore(max_concurrent or self.max_concurrent_chunks)
+        
+        # Identical chunks are translated once, and short chunks share a
+        # single request of at most char_limit characters
+        unique_chunks = list(dict.fromkeys(chunks))
+        packs = self._pack_chunks(unique_chunks, char_limit)
+        
+        completed = 0
+        
+        async def translate(indices: List[int]) -> Tuple[List[str], str]:
+            nonlocal completed
+            async with semaphore:
+                translated, pack_backend = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._translate_pack_with_fallback, 
+                    [unique_chunks[i] for i in indices], target_lang, source_lang, backend, char_limit
+                )
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, len(packs), ' '.join(translated))
+            return translated, pack_backend
+        
+        translated_packs = await asyncio.gather(*(translate(indices) for indices in packs))
+        
+        translations = {}
+        for indices, (translated, pack_backend) in zip(packs, translated_packs):
+            for i, translated_chunk in zip(indices, translated):
+                translations[unique_chunks[i]] = (translated_chunk, pack_backend)
+        return (
+            [translations[chunk][0] for chunk in chunks], 
+            [translations[chunk][1] for chunk in chunks]
+        )
+    
+    def _pack_chunks(self, chunks: List[str], char_limit: int) -> List[List[int]]:
+        """Group consecutive chunk indices so each group fits one request"""
+        packs = []
+        current = []
         current_length = 0
         
-        for word in words:
-            word_length = len(word) + 1  # +1 for space
+        for i, chunk in enumerate(chunks):
+            added_length = len(chunk) + (len(PACK_SEPARATOR) if current else 0)
+            if current and current_length + added_length > char_limit:
+                packs.append(current)
+                current = []
+                current_length = 0
+                added_length = len(chunk)
+            current.append(i)
+            current_length += added_length
+        
+        if current:
+            packs.append(current)
+        return packs
+    
+    def _translate_pack_with_fallback(self, pack: List[str], target_lang: str, source_lang: str, 
+                                      backend: str, char_limit: int) -> Tuple[List[str], str]:
+        """
+        Translate a pack, retrying it on the fallback backends if a backend fails
+        
+        Chunks are re-split and re-packed for backends accepting fewer
+        characters per request than char_limit.
+        
+        Returns:
+            Tuple of (translations, backend that produced them)
+        
+        Raises:
+            The last backend error once every backend has failed
+        """
+        for attempt_backend in dict.fromkeys([backend, 'google', 'libre', 'mymemory']):
+            try:
+                limit = min(char_limit, self._backend_char_limit(attempt_backend))
+                splits = [self._split_text_into_chunks(chunk, limit) for chunk in pack]
+                pieces = [piece for chunks, _ in splits for piece in chunks]
+                translated_pieces = []
+                for indices in self._pack_chunks(pieces, limit):
+                    translated_pieces.extend(self._translate_pack(
+                        [pieces[i] for i in indices], target_lang, source_lang, attempt_backend
+                    ))
+                
+            except Exception as e:
+                logger.warning(f"Backend {attempt_backend} failed: {str(e)}")
+                last_error = e
+                continue
             
-            if current_length + word_length > chunk_size and current_chunk:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = [word]
-                current_length = word_length
+            translated = []
+            offset = 0
+            for chunks, separators in splits:
+                translated.append(self._join_chunks(translated_pieces[offset:offset + len(chunks)], separators))
+                offset += len(chunks)
+            return translated, attempt_backend
+        
+        raise last_error
+    
+    def _translate_pack(self, pack: List[str], target_lang: str, 
+                        source_lang: str, backend: str) -> List[str]:
+        """
+        Translate several chunks with a single backend request
+        
+        Uncached chunks are joined with PACK_SEPARATOR and the response is
+        split back apart. If the backend mangles the separators, each chunk
+        is translated on its own instead; backend errors are raised.
+        """
+        if len(pack) == 1:
+            return [self._translate_chunk(pack[0], target_lang, source_lang, backend)]
+        
+        cache_keys = [
+            self.translation_cache.make_key(chunk, source_lang, target_lang, backend) 
+            for chunk in pack
+        ]
+        results = [self.translation_cache.get(key) for key in cache_keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        if len(missing) > 1:
+            # A failed request (rate limit, server error, ...) is raised rather
+            # than retried chunk by chunk, which would only add load
+            translated = self._call_backend(
+                PACK_SEPARATOR.join(pack[i] for i in missing), 
+                target_lang, source_lang, backend
+            )
+            parts = PACK_SPLIT_RE.split((translated or '').strip())
+            
+            if len(parts) == len(missing):
+                for i, part in zip(missing, parts):
+                    results[i] = part or pack[i]
+                    self._cache_translation(cache_keys[i], pack[i], part)
+                missing = []
+            else:
+                logger.info(f"Packed translation with {backend} lost its separators, "
+                            f"translating {len(missing)} chunks individually")
+        
+        for i in missing:
+            results[i] = self._translate_chunk(pack[i], target_lang, source_lang, backend)
+        return results
+    
+    def _translate_chunk(self, chunk: str, target_lang: str, 
+                        source_lang: str, backend: str) -> str:
+        """Translate a single chunk of text, raising on backend errors"""
+        cache_key = self.translation_cache.make_key(chunk, source_lang, target_lang, backend)
+        cached = self.translation_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        translated = self._call_backend(chunk, target_lang, source_lang, backend)
+        self._cache_translation(cache_key, chunk, translated)
+        return translated or chunk
+    
+    def _cache_translation(self, cache_key: Tuple[bytes, str, str, str], 
+                           chunk: str, translated: Optional[str]) -> None:
+        """
+        Cache a backend reply unless it is empty or just echoes the chunk
+        
+        Backends answer some failures with an empty or untranslated text;
+        caching those would keep serving (and persisting) the glitch.
+        """
+        if translated and translated.strip() and translated != chunk:
+            self.translation_cache.put(cache_key, translated)
+    
+    def _call_backend(self, text: str, target_lang: str, 
+                      source_lang: str, backend: str) -> str:
+        """Send one request to a backend under its rate limit and backpressure control"""
+        self.token_buckets[backend].take()
+        self.rate_limiter.wait_if_throttled(backend, len(text))
+        with self.backpressure[backend].slot():
+            return self._translate_chunk_uncached(text, target_lang, source_lang, backend)
+    
+    def _translate_chunk_uncached(self, chunk: str, target_lang: str, 
+                                  source_lang: str, backend: str) -> str:
+        """Translate a single chunk of text, raising on backend errors
+        
+        Returns the backend's reply unchanged, which may be empty.
+        """
+        # Get appropriate language codes for backend
+        backend_target = self._get_backend_language_code(target_lang, backend)
+        backend_source = self._get_backend_language_code(source_lang, backend) if source_lang != 'auto' else source_lang
+        
+        translator = self._get_backend_translator(backend, backend_source, backend_target)
+        
+        # Translate the chunk
+        return translator.translate(chunk)
+    
+    def _get_backend_translator(self, backend: str, source: str, target: str):
+        """
+        Get a translator instance for this worker thread, creating it on first use
+        
+        deep-translator objects keep per-request state, so instances are
+        reused within a thread but never shared between threads. Each
+        thread keeps at most translator_pool_size instances, evicting the
+        least recently used (backend, source, target) combination.
+        """
+        translators = getattr(self._thread_local, 'translators', None)
+        if translators is None:
+            translators = self._thread_local.translators = OrderedDict()
+        
+        key = (backend, source, target)
+        translator = translators.get(key)
+        if translator is None:
+            translator = translators[key] = self._create_backend_translator(backend, source, target)
+            if len(translators) > self.translator_pool_size:
+                translators.popitem(last=False)
+        else:
+            translators.move_to_end(key)
+        return translator
+    
+    def _create_backend_translator(self, backend: str, source: str, target: str):
+        """Initialize translator based on backend"""
+        if backend not in self.backends:
+            raise ValueError(f"Unsupported backend: {backend}")
+        return self.backends[backend](source=source, target=target)
+    
+    def _backend_char_limit(self, backend: str) -> int:
+        """Largest number of characters a backend accepts in one request"""
+        return BACKEND_MAX_CHARS.get(backend, DEFAULT_BACKEND_MAX_CHARS) - 1
+    
+    def _split_text_into_chunks(self, text: str, chunk_size: int) -> Tuple[List[str], List[str]]:
+        """
+        Split text into chunks for translation, greedily packing whole sentences
+        
+        Returns:
+            Tuple of (chunks, separators) with one more separator than chunks:
+            separators[0] is the whitespace before chunks[0], separators[i + 1]
+            the whitespace after chunks[i], so _join_chunks restores the text
+        """
+        if len(text) <= chunk_size:
+            return [text], ['', '']
+        if len(text) >= self.vectorized_chunking_threshold:
+            spans = self._large_text_chunk_spans(text, chunk_size)
+        else:
+            spans = self._chunk_spans(text, chunk_size)
+        
+        chunks = [text[start:end] for start, end in spans]
+        bounds = [0, *(offset for span in spans for offset in span), len(text)]
+        separators = [text[bounds[i]:bounds[i + 1]] for i in range(0, len(bounds), 2)]
+        return chunks, separators
+    
+    def _chunk_spans(self, text: str, chunk_size: int) -> List[Tuple[int, int]]:
+        """Character spans of chunks made by greedily packing whole sentences"""
+        piece_starts = []
+        piece_ends = []
+        sentence_start = 0
+        for match in [*SENTENCE_SPLIT_RE.finditer(text), None]:
+            sentence_end = match.start() if match else len(text)
+            if sentence_end - sentence_start <= chunk_size:
+                if sentence_end > sentence_start:
+                    piece_starts.append(sentence_start)
+                    piece_ends.append(sentence_end)
             else:
-                current_chunk.append(word)
-                current_length += word_length
+                # Sentences longer than a chunk fall back to word-level
+                # splitting, and words longer than a chunk are cut
+                for word in WORD_RE.finditer(text, sentence_start, sentence_end):
+                    for start in range(word.start(), word.end(), chunk_size):
+                        piece_starts.append(start)
+                        piece_ends.append(min(start + chunk_size, word.end()))
+            if match:
+                sentence_start = match.end()
+        
+        # Greedy packing: each chunk ends at the last piece whose end still
+        # fits in the chunk, found by binary search over the piece end offsets
+        # instead of a per-piece Python loop
+        ends = np.array(piece_ends, dtype=np.int64)
         
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
+        spans = []
+        start = 0
+        while start < len(piece_starts):
+            end = int(np.searchsorted(ends, piece_starts[start] + chunk_size, side='right'))
+            end = max(end, start + 1)
+            spans.append((piece_starts[start], piece_ends[end - 1]))
+            start = end
         
-        return chunks
+        return spans
+    
+    def _large_text_chunk_spans(self, text: str, chunk_size: int) -> List[Tuple[int, int]]:
+        """
+        Character spans of chunks for very large text, using vectorized boundary search
+        
+        Candidate boundaries are found with numpy over the text's code points
+        (UTF-32, so array indices are character offsets). Each chunk ends at
+        the last sentence break inside its window, else the last whitespace,
+        else is cut at chunk_size.
+        """
+        # surrogatepass keeps lone surrogates (e.g. from a broken PDF text
+        # layer) as one code unit each, so indices stay character offsets
+        codes = np.frombuffer(text.encode('utf-32-le', errors='surrogatepass'), dtype=np.uint32)
+        is_space = np.isin(codes, WHITESPACE_CODES)
+        is_sentence_end = np.isin(codes, SENTENCE_END_CODES)
+        
+        space_breaks = np.flatnonzero(is_space)
+        sentence_breaks = np.flatnonzero(is_sentence_end[:-1] & is_space[1:]) + 1
+        
+        spans = []
+        start = 0
+        while start < len(text):
+            window_end = start + chunk_size
+            if window_end >= len(text):
+                end = len(text)
+            else:
+                end = window_end
+                for breaks in (sentence_breaks, space_breaks):
+                    i = int(np.searchsorted(breaks, window_end, side='right')) - 1
+                    if i >= 0 and breaks[i] > start:
+                        end = int(breaks[i])
+                        break
+            
+            # Whitespace at the window edges belongs to the separators
+            window = text[start:end]
+            chunk = window.strip()
+            if chunk:
+                chunk_start = start + len(window) - len(window.lstrip())
+                spans.append((chunk_start, chunk_start + len(chunk)))
+            start = end
+        
+        return spans
+    
+    @staticmethod
+    def _join_chunks(chunks: List[str], separators: List[str]) -> str:
+        """Reassemble (translated) chunks with the whitespace that originally surrounded them"""
+        parts = [separators[0]]
+        for chunk, separator in zip(chunks, separators[1:]):
+            parts.append(chunk)
+            parts.append(separator)
+        return ''.join(parts)
     
     def _clean_text_for_detection(self, text: str) -> str:
         """Clean text for better language detection"""
         # Remove extra whitespace, URLs, emails, etc.
-        clean_text = re.sub(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', '', text)
-        clean_text = re.sub(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', '', clean_text)
-        clean_text = re.sub(r'\s+', ' ', clean_text)
+        clean_text = DETECTION_CLEAN_RE.sub(
+            lambda match: ' ' if match.lastindex == 3 else '', text
+        )
         return clean_text.strip()
     
-    def _calculate_confidence(self, text: str, detected_lang: str) -> float:
-        """Calculate confidence score for language detection"""
-        # This is a simplified confidence calculation
-        # In practice, you might use langdetect's probability features
-        try:
-            from langdetect import detect_langs
-            probs = detect_langs(text)
-            for prob in probs:
-                if prob.lang == detected_lang:
-                    return round(prob.prob, 2)
-            return 0.5  # Default moderate confidence
-        except:
-            return 0.5
+    def _detection_sample(self, clean_text: str) -> str:
+        """
+        Bound the text passed to langdetect, whose accuracy saturates after a
+        few KB: long texts are sampled from their head, middle and tail
+        """
+        if len(clean_text) <= self.detection_sample_size:
+            return clean_text
+        
+        head = self.detection_sample_size // 2
+        part = self.detection_sample_size // 4
+        middle = len(clean_text) // 2
+        return ' '.join((
+            clean_text[:head],
+            clean_text[middle:middle + part],
+            clean_text[-part:]
+        ))
     
     def _get_language_name(self, lang_code: str) -> str:
         """Get language name from code"""
-        # Extended language names
-        language_names = {
-            'en': 'English', 'hi': 'Hindi', 'mr': 'Marathi', 'sa': 'Sanskrit',
-            'fr': 'French', 'es': 'Spanish', 'de': 'German', 'it': 'Italian',
-            'pt': 'Portuguese', 'ru': 'Russian', 'ja': 'Japanese', 'ko': 'Korean',
-            'zh': 'Chinese', 'ar': 'Arabic', 'th': 'Thai', 'vi': 'Vietnamese'
-        }
-        return language_names.get(lang_code, f"Language ({lang_code})")
+        return LANGUAGE_NAMES.get(lang_code, f"Language ({lang_code})")
     
     def _get_backend_language_code(self, lang_code: str, backend: str) -> str:
         """Get the appropriate language code for a specific backend"""
@@ -306,34 +1284,97 @@ class DocumentTranslator:
             return self.language_mappings[lang_code].get(backend, lang_code)
         return lang_code
     
+    def save_translation_memory(self) -> None:
+        """Persist cached chunk translations if a translation memory file is set"""
+        self.translation_cache.save()
+    
     def get_available_languages(self) -> Dict[str, str]:
         """Get list of supported languages"""
         return self.supported_languages.copy()
     
     def batch_translate(self, texts: List[str], target_lang: str, 
                        source_lang: str = 'auto', 
-                       backend: str = 'google') -> List[Dict[str, Any]]:
+                       backend: str = 'google',
+                       max_concurrent: int = 16,
+                       chunk_size: int = 5000) -> List[Dict[str, Any]]:
         """
         Translate multiple texts in batch
         
+        Like translate_text, safe to call while an event loop is running;
+        coroutines should await batch_translate_async instead.
+        
         Args:
             texts: List of texts to translate
             target_lang: Target language code
             source_lang: Source language code
             backend: Translation backend
+            max_concurrent: Maximum number of backend requests in flight
+            chunk_size: Size of text chunks (and packed requests) for translation
             
         Returns:
             List of translation results
         """
-        results = []
+        results = self._run_sync(self.batch_translate_async(
+            texts, target_lang, source_lang, backend, max_concurrent, chunk_size
+        ))
+        self.save_translation_memory()
+        return results
+    
+    async def batch_translate_async(self, texts: List[str], target_lang: str, 
+                                    source_lang: str = 'auto', 
+                                    backend: str = 'google',
+                                    max_concurrent: int = 16,
+                                    chunk_size: int = 5000) -> List[Dict[str, Any]]:
+        """
+        Translate multiple texts concurrently
         
-        for i, text in enumerate(texts):
-            logger.info(f"Translating text {i+1}/{len(texts)}")
-            result = self.translate_text(text, target_lang, source_lang, backend)
-            results.append(result)
+        Chunks of different texts are packed into shared backend requests,
+        and results are returned in input order.
+        
+        Args:
+            texts: List of texts to translate
+            target_lang: Target language code
+            source_lang: Source language code
+            backend: Translation backend
+            max_concurrent: Maximum number of backend requests in flight
+            chunk_size: Size of text chunks (and packed requests) for translation
             
-            # Small delay between translations
-            if i < len(texts) - 1:
-                time.sleep(0.2)
+        Returns:
+            List of translation results
+        """
+        # Identical texts are translated once and their result reused
+        unique_texts = list(dict.fromkeys(texts))
+        logger.info(f"Translating {len(unique_texts)} texts")
         
-        return results
\ No newline at end of file
+        unique_results = await self._translate_texts_async(
+            unique_texts, target_lang, source_lang, backend, chunk_size, 
+            max_concurrent=max_concurrent
+        )
+        results_by_text = dict(zip(unique_texts, unique_results))
+        return [dict(results_by_text[text]) for text in texts]
+
+
+_shared_translator: Optional[DocumentTranslator] = None
+_shared_translator_lock = threading.Lock()
+
+
+def get_shared_translator(translation_memory_path: Optional[Union[str, Path]] = None) -> DocumentTranslator:
+    """
+    Get the process-wide DocumentTranslator, creating it on first call
+    
+    Sharing one instance lets every caller reuse its translation cache,
+    rate limits, and the backend translators pooled by its persistent
+    worker threads (at most translator_pool_size per thread).
+    
+    Args:
+        translation_memory_path: Translation memory file, only used when
+            the shared instance is first created
+        
+    Returns:
+        The shared DocumentTranslator
+    """
+    global _shared_translator
+    with _shared_translator_lock:
+        if _shared_translator is None:
+            _shared_translator = DocumentTranslator(translation_memory_path=translation_memory_path)
+        return _shared_translator
@@ -1,19 +1,54 @@
 """
 Utility functions for the document translator
 """
+import asyncio
 import os
+import re
 import hashlib
 import tempfile
 from pathlib import Path
+from types import MappingProxyType
 from typing import Union, Dict, Any, Optional
 import logging
 from datetime import datetime
 from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+try:
+    from blake3 import blake3
+except ImportError:  # Optional SIMD-accelerated hashing
+    blake3 = None
 import io
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Display names (with flags) for language codes
+LANGUAGE_DISPLAY_NAMES = MappingProxyType({
+    'en': 'English 🇺🇸',
+    'hi': 'Hindi 🇮🇳', 
+    'mr': 'Marathi 🇮🇳',
+    'sa': 'Sanskrit 🕉️',
+    'fr': 'French 🇫🇷',
+    'es': 'Spanish 🇪🇸',
+    'de': 'German 🇩🇪',
+    'it': 'Italian 🇮🇹',
+    'pt': 'Portuguese 🇵🇹',
+    'ru': 'Russian 🇷🇺',
+    'ja': 'Japanese 🇯🇵',
+    'ko': 'Korean 🇰🇷',
+    'zh': 'Chinese 🇨🇳',
+    'ar': 'Arabic 🇸🇦',
+    'unknown': 'Unknown Language 🌐',
+    'auto': 'Auto Detect 🔍'
+})
+
+# File extensions accepted for upload
+SUPPORTED_FORMATS = frozenset({'.pdf', '.docx', '.txt'})
+
+# Characters not allowed in saved file names
+INVALID_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+
 class DocumentUtils:
     """Utility functions for document operations"""
     
@@ -40,14 +75,12 @@ class DocumentUtils:
                 }
             
             # Check file extension
-            file_path = Path(filename)
-            extension = file_path.suffix.lower()
-            supported_formats = {'.pdf', '.docx', '.txt'}
+            extension = DocumentUtils.get_extension(filename)
             
-            if extension not in supported_formats:
+            if extension not in SUPPORTED_FORMATS:
                 return {
                     'valid': False,
-                    'error': f'Unsupported file format. Supported: {", ".join(supported_formats)}'
+                    'error': f'Unsupported file format. Supported: {", ".join(sorted(SUPPORTED_FORMATS))}'
                 }
             
             # Check if file content is not empty
@@ -70,10 +103,26 @@ class DocumentUtils:
                 'error': f'File validation error: {str(e)}'
             }
     
+    @staticmethod
+    def get_extension(filename: str) -> str:
+        """Lower-cased extension of a file name (e.g. '.pdf'), or '' if none"""
+        name = filename.rpartition('/')[2].rpartition('\\')[2]
+        stem, dot, extension = name.rpartition('.')
+        if not dot or not stem or not extension:
+            return ''
+        return '.' + extension.lower()
+    
     @staticmethod
     def generate_file_hash(content: bytes) -> str:
-        """Generate MD5 hash of file content"""
-        return hashlib.md5(content).hexdigest()
+        """
+        Generate a hash of file content for use as an identity/cache key
+        
+        Uses BLAKE3 when the optional blake3 package is installed, otherwise
+        BLAKE2b; both are faster than MD5 on large uploads.
+        """
+        if blake3 is not None:
+            return blake3(content).hexdigest()
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
     
     @staticmethod
     def save_temp_file(content: bytes, filename: str) -> str:
@@ -99,6 +148,20 @@ class DocumentUtils:
             logger.error(f"Error saving temp file: {str(e)}")
             raise
     
+    @staticmethod
+    async def save_temp_file_async(content: bytes, filename: str) -> str:
+        """
+        Save content to temporary file without blocking the event loop
+        
+        Args:
+            content: File content as bytes
+            filename: Original filename (used for extension)
+            
+        Returns:
+            Path to temporary file
+        """
+        return await asyncio.to_thread(DocumentUtils.save_temp_file, content, filename)
+    
     @staticmethod
     def cleanup_temp_file(file_path: str) -> None:
         """Remove temporary file"""
@@ -125,47 +188,34 @@ class DocumentUtils:
         """
         try:
             pdf = FPDF()
+            pdf.set_auto_page_break(True, margin=15)
             pdf.add_page()
             
             # Add title
             pdf.set_font('Arial', 'B', 16)
-            pdf.cell(0, 10, f'Translation: {original_filename}', ln=True, align='C')
+            pdf.cell(0, 10, f'Translation: {original_filename}', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             pdf.ln(5)
             
             # Add translation info
             pdf.set_font('Arial', 'I', 10)
-            pdf.cell(0, 5, f'Translated from {source_lang} to {target_lang}', ln=True)
-            pdf.cell(0, 5, f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}', ln=True)
+            pdf.cell(0, 5, f'Translated from {source_lang} to {target_lang}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.cell(0, 5, f'Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             pdf.ln(10)
             
             # Add translated text
             pdf.set_font('Arial', '', 12)
             
-            # Split text into lines and add to PDF
+            # Split text into lines and add to PDF; multi_cell wraps long
+            # lines to the page width using FPDF's own string-width metrics
             lines = translated_text.split('\n')
             for line in lines:
                 if line.strip():
-                    # Handle long lines by wrapping
-                    if len(line) > 80:
-                        words = line.split(' ')
-                        current_line = ""
-                        for word in words:
-                            if len(current_line + word + ' ') > 80:
-                                if current_line:
-                                    pdf.cell(0, 6, current_line.strip(), ln=True)
-                                current_line = word + ' '
-                            else:
-                                current_line += word + ' '
-                        if current_line:
-                            pdf.cell(0, 6, current_line.strip(), ln=True)
-                    else:
-                        pdf.cell(0, 6, line, ln=True)
+                    pdf.multi_cell(0, 6, line, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
                 else:
                     pdf.ln(3)  # Empty line spacing
             
-            # Get PDF content
-            pdf_content = bytes(pdf.output(dest='S'))
-            return pdf_content
+            # Get PDF content; the intermediate bytearray is released at once
+            return bytes(pdf.output())
             
         except Exception as e:
             logger.error(f"Error creating PDF: {str(e)}")
@@ -173,10 +223,10 @@ class DocumentUtils:
             error_pdf = FPDF()
             error_pdf.add_page()
             error_pdf.set_font('Arial', 'B', 16)
-            error_pdf.cell(0, 10, 'Translation Error', ln=True, align='C')
+            error_pdf.cell(0, 10, 'Translation Error', new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
             error_pdf.set_font('Arial', '', 12)
-            error_pdf.cell(0, 10, f'Error creating translated PDF: {str(e)}', ln=True)
-            return bytes(error_pdf.output(dest='S'))
+            error_pdf.cell(0, 10, f'Error creating translated PDF: {str(e)}', new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            return bytes(error_pdf.output())
 
     
     @staticmethod
@@ -204,8 +254,7 @@ class DocumentUtils:
     def clean_filename(filename: str) -> str:
         """Clean filename for safe saving"""
         # Remove or replace invalid characters
-        import re
-        cleaned = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        cleaned = INVALID_FILENAME_CHARS_RE.sub('_', filename)
         return cleaned.strip()
     
     @staticmethod
@@ -214,36 +263,22 @@ class DocumentUtils:
         Get display name for language code - FIXED VERSION
         """
         try:
+            # Fast path for the common exact-code case
+            if isinstance(lang_code, str):
+                display_name = LANGUAGE_DISPLAY_NAMES.get(lang_code)
+                if display_name is not None:
+                    return display_name
+            elif lang_code is None:
+                return LANGUAGE_DISPLAY_NAMES['unknown']
             # Fix: Handle different input types
-            if isinstance(lang_code, list):
+            elif isinstance(lang_code, list):
                 # If it's a list, take the first element
                 lang_code = lang_code[0] if lang_code else 'unknown'
-            elif lang_code is None:
-                lang_code = 'unknown'
             
             # Ensure it's a string
             lang_code = str(lang_code).strip().lower()
             
-            language_names = {
-                'en': 'English 🇺🇸',
-                'hi': 'Hindi 🇮🇳', 
-                'mr': 'Marathi 🇮🇳',
-                'sa': 'Sanskrit 🕉️',
-                'fr': 'French 🇫🇷',
-                'es': 'Spanish 🇪🇸',
-                'de': 'German 🇩🇪',
-                'it': 'Italian 🇮🇹',
-                'pt': 'Portuguese 🇵🇹',
-                'ru': 'Russian 🇷🇺',
-                'ja': 'Japanese 🇯🇵',
-                'ko': 'Korean 🇰🇷',
-                'zh': 'Chinese 🇨🇳',
-                'ar': 'Arabic 🇸🇦',
-                'unknown': 'Unknown Language 🌐',
-                'auto': 'Auto Detect 🔍'
-            }
-            
-            return language_names.get(lang_code, f'{lang_code.upper()} 🌐')
+            return LANGUAGE_DISPLAY_NAMES.get(lang_code, f'{lang_code.upper()} 🌐')
             
         except Exception as e:
             logger.error(f"Error in get_language_display_name: {str(e)}")
@@ -0,0 +1,272 @@
+"""
+Tests for the translator module
+"""
+import asyncio
+import random
+
+import pytest
+from deep_translator.exceptions import TooManyRequests
+
+from src.translator import DocumentTranslator, TranslationCache
+
+
+@pytest.fixture
+def translator():
+    return DocumentTranslator()
+
+
+def test_large_text_chunking_handles_lone_surrogates(translator):
+    text = ("word " * 60000) + "\ud800 tail."
+    chunks, separators = translator._split_text_into_chunks(text, 4999)
+    
+    assert all(len(chunk) <= 4999 for chunk in chunks)
+    assert "\ud800" in "".join(chunks)
+
+
+@pytest.mark.parametrize("vectorized_threshold", [200, 10 ** 9])
+def test_split_and_join_round_trip(translator, vectorized_threshold):
+    translator.vectorized_chunking_threshold = vectorized_threshold
+    rng = random.Random(0)
+    words = ["alpha", "beta", "गणना", "x" * 30, "y" * 700, "end.", "stop!", "पूर्ण।", "\n", "\n\n", "  "]
+    
+    for _ in range(300):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(0, 400)))
+        text = rng.choice(["", "  ", "\n"]) + text + rng.choice(["", "  ", "\n"])
+        chunk_size = rng.randint(35, 500)
+        
+        chunks, separators = translator._split_text_into_chunks(text, chunk_size)
+        
+        assert len(separators) == len(chunks) + 1
+        assert all(0 < len(chunk) <= chunk_size for chunk in chunks if len(text) > chunk_size)
+        assert translator._join_chunks(chunks, separators) == text
+
+
+def test_trailing_whitespace_after_word_split_sentence_is_kept(translator):
+    text = "word " * 30
+    chunks, separators = translator._split_text_into_chunks(text, 40)
+    
+    assert translator._join_chunks(chunks, separators) == text
+
+
+@pytest.mark.parametrize("reply", ["", None, "echo me"])
+def test_empty_or_echoed_replies_are_not_cached(translator, monkeypatch, reply):
+    monkeypatch.setattr(translator, "_translate_chunk_uncached", lambda chunk, *args: reply)
+    
+    assert translator._translate_chunk("echo me", "hi", "en", "google") == "echo me"
+    assert len(translator.translation_cache) == 0
+
+
+def test_empty_packed_parts_are_not_cached(translator, monkeypatch):
+    monkeypatch.setattr(translator, "_translate_chunk_uncached", 
+                        lambda chunk, *args: "uno\n%%\n\n%%\ntres")
+    
+    results = translator._translate_pack(["one", "two", "three"], "es", "en", "google")
+    
+    assert results == ["uno", "two", "tres"]
+    assert len(translator.translation_cache) == 2
+
+
+def test_cache_round_trip(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    cache = TranslationCache(path=path)
+    key = cache.make_key("hello", "en", "hi", "google")
+    cache.put(key, "नमस्ते")
+    cache.save()
+    
+    assert TranslationCache(path=path).get(key) == "नमस्ते"
+
+
+def test_cache_does_not_persist_empty_or_echoed_values(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    cache = TranslationCache(path=path)
+    cache.put(cache.make_key("hello", "en", "hi", "google"), "hello")
+    cache.put(cache.make_key("world", "en", "hi", "google"), " ")
+    cache.save()
+    
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("line", [
+    '{"a": 1}',
+    '["zz", "en", "hi", "google", "x"]',
+    '["00", "en", "hi", "google", "x"]',
+    '["' + "00" * 16 + '", "en", "hi", "google"]',
+    '["' + "00" * 16 + '", "en", "hi", "google", 5]',
+    '["' + "00" * 16 + '", "en", "hi", "google", ""]',
+    'not json',
+])
+def test_parse_entry_rejects_malformed_lines(line):
+    with pytest.raises((ValueError, TypeError)):
+        TranslationCache._parse_entry(line)
+
+
+def test_load_skips_malformed_and_blank_lines(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    cache = TranslationCache(path=path)
+    key = cache.make_key("hello", "en", "hi", "google")
+    cache.put(key, "नमस्ते")
+    cache.save()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('\n{"a": 1}\n["zz", "en", "hi", "google", "x"]\nnot json\n')
+    
+    loaded = TranslationCache(path=path)
+    
+    assert len(loaded) == 1
+    assert loaded.get(key) == "नमस्ते"
+
+
+def test_save_appends_then_compacts(tmp_path):
+    path = tmp_path / "memory.jsonl"
+    cache = TranslationCache(maxsize=2, path=path)
+    
+    for i in range(4):
+        cache.put(cache.make_key(f"chunk {i}", "en", "hi", "google"), f"translation {i}")
+        cache.save()
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == i + 1
+    
+    cache.put(cache.make_key("chunk 4", "en", "hi", "google"), "translation 4")
+    cache.save()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    
+    assert len(lines) == 2
+    assert TranslationCache(maxsize=2, path=path).get(
+        cache.make_key("chunk 4", "en", "hi", "google")) == "translation 4"
+
+
+def test_chunks_with_lone_surrogates_can_be_cached(translator, monkeypatch):
+    monkeypatch.setattr(translator, "_translate_chunk_uncached", lambda chunk, *args: "translated")
+    
+    assert translator._translate_chunk("\ud800 tail.", "hi", "en", "google") == "translated"
+    assert len(translator.translation_cache) == 1
+
+
+def test_failed_pack_is_not_retried_chunk_by_chunk(translator, monkeypatch):
+    calls = []
+    
+    def overloaded(chunk, *args):
+        calls.append(chunk)
+        raise TooManyRequests()
+    
+    monkeypatch.setattr(translator, "_translate_chunk_uncached", overloaded)
+    
+    with pytest.raises(TooManyRequests):
+        translator._translate_pack(["one", "two", "three"], "es", "en", "google")
+    assert len(calls) == 1
+
+
+def test_mangled_pack_falls_back_to_single_chunks(translator, monkeypatch):
+    calls = []
+    
+    def mangling(chunk, *args):
+        calls.append(chunk)
+        return "merged" if "%%" in chunk else chunk.upper()
+    
+    monkeypatch.setattr(translator, "_translate_chunk_uncached", mangling)
+    
+    assert translator._translate_pack(["one", "two"], "es", "en", "google") == ["ONE", "TWO"]
+    assert len(calls) == 3
+
+
+def test_failed_backend_falls_back_per_pack(translator, monkeypatch):
+    requests = []
+    
+    def flaky(text, target_lang, source_lang, backend):
+        requests.append((backend, len(text)))
+        if backend == "google":
+            raise TooManyRequests()
+        return text.upper()
+    
+    monkeypatch.setattr(translator, "_call_backend", flaky)
+    text = "A short sentence. " * 100
+    
+    result = translator.translate_text(text, "hi", "en", backend="google", chunk_size=1500)
+    
+    assert result["error"] is None
+    assert result["translated_text"] == text.upper()
+    assert result["backend_used"] == "libre"
+    assert all(length <= 1999 for backend, length in requests if backend == "libre")
+
+
+def test_all_backends_failing_is_reported(translator, monkeypatch):
+    def failing(*args):
+        raise TooManyRequests()
+    
+    monkeypatch.setattr(translator, "_call_backend", failing)
+    
+    result = translator.translate_text("Hello there.", "hi", "en", backend="google")
+    
+    assert result["error"] == "All translation backends failed"
+
+
+def test_fallback_resplits_for_smaller_backend_limits(translator, monkeypatch):
+    requests = []
+    
+    def only_mymemory(text, target_lang, source_lang, backend):
+        if backend != "mymemory":
+            raise TooManyRequests()
+        requests.append(len(text))
+        return text.upper()
+    
+    monkeypatch.setattr(translator, "_call_backend", only_mymemory)
+    text = "word " * 500
+    
+    result = translator.translate_text(text, "hi", "en", backend="google")
+    
+    assert result["translated_text"] == text.upper()
+    assert result["backend_used"] == "mymemory"
+    assert max(requests) <= 499
+
+
+def _translate_stream(translator, pages, **kwargs):
+    async def consume():
+        return [result async for result in translator.translate_text_stream(iter(pages), "hi", **kwargs)]
+    return asyncio.run(consume())
+
+
+def test_stream_packs_pages_into_shared_requests(translator, monkeypatch):
+    requests = []
+    
+    def upper(text, *args):
+        requests.append(text)
+        return text.upper()
+    
+    monkeypatch.setattr(translator, "_call_backend", upper)
+    pages = [f"Page {i} has a sentence. And another one." for i in range(200)] + ["  ", "Last page."]
+    
+    results = _translate_stream(translator, pages, source_lang="en")
+    
+    assert [r["translated_text"] for r in results[:200]] == [page.upper() for page in pages[:200]]
+    assert results[200]["error"] == "Empty text provided"
+    assert len(requests) < 5
+    assert all(len(request) <= 4999 for request in requests)
+    combined = translator.combine_results(results)
+    assert combined["error"] is None
+    assert combined["translated_text"] == "\n\n".join(page.upper() for page in pages if page.strip())
+
+
+def test_stream_reports_failed_pages(translator, monkeypatch):
+    def failing(*args):
+        raise TooManyRequests()
+    
+    monkeypatch.setattr(translator, "_call_backend", failing)
+    
+    results = _translate_stream(translator, ["Hello there.", "General Kenobi."], source_lang="en")
+    
+    assert [r["error"] for r in results] == ["All translation backends failed"] * 2
+    assert translator.combine_results(results)["error"] == "All translation backends failed"
+
+
+def test_sync_wrappers_work_inside_a_running_loop(translator, monkeypatch):
+    monkeypatch.setattr(translator, "_call_backend", lambda text, *args: text.upper())
+    
+    async def call_from_coroutine():
+        return (
+            translator.translate_text("Hello there.", "hi", "en"),
+            translator.batch_translate(["One.", "Two."], "hi", "en")
+        )
+    
+    single, batch = asyncio.run(call_from_coroutine())
+    
+    assert single["translated_text"] == "HELLO THERE."
+    assert [r["translated_text"] for r in batch] == ["ONE.", "TWO."]